@@ -0,0 +1,129 @@
+import os
+import logging
+import threading
+
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_client(service='bigquery', project=None, credentials=None, **kwargs):
+    """Return process-wide client for service, built once per (service, project, credential identity) and shared by all functions.
+
+    Clients reuse discovered credentials, access tokens and HTTP connection pool across calls. Clients are built lazily on first use,
+    use warm_clients() in global scope of Cloud Functions to build them during cold start.
+
+    Keyword Arguments:
+        service {str} -- {'bigquery','storage','azure_blob'} (default: {'bigquery'})
+            'bigquery' returns google.cloud.bigquery.Client
+            'storage' returns google.cloud.storage.Client
+            'azure_blob' returns azure.storage.blob.blockblobservice.BlockBlobService, requires account_name and account_key keyword arguments
+        project {str} -- gcp project id (default: {None} i.e. project of default credentials)
+        credentials {google.auth.credentials.Credentials} -- non-default credentials e.g. get_gcp_service_account(filepath) (default: {None} i.e.
+            default credentials from ``GOOGLE_APPLICATION_CREDENTIALS`` env variable or compute environment)
+        kwargs {dict} -- any other keyword argument of client constructor
+
+    Returns:
+        client of service
+
+    Example:
+    from pyplatform.common.clients import get_client
+    client = get_client('bigquery')
+    storage_client = get_client('storage', project='project_id')
+    blob_service = get_client('azure_blob', account_name='account_name', account_key='account_key')
+
+    """
+    key = (os.getpid(), service, project, _credential_identity(
+        service, credentials, kwargs), tuple(sorted((name, repr(value)) for name, value in kwargs.items() if name != 'account_key')))
+    client = _CLIENTS.get(key)
+    if client is None:
+        with _CLIENTS_LOCK:
+            client = _CLIENTS.get(key)
+            if client is None:
+                logging.debug(
+                    f"instantiating {service} client from defualt environment variable" if credentials is None and service != 'azure_blob'
+                    else f"instantiating {service} client")
+                client = _build_client(
+                    service, project=project, credentials=credentials, **kwargs)
+                _CLIENTS[key] = client
+    return client
+
+
+def warm_clients(services=('bigquery', 'storage'), project=None, credentials=None, refresh_token=True):
+    """Build clients of services and fetch access token ahead of first call e.g. in global scope of Cloud Function.
+
+    Keyword Arguments:
+        services {list} -- services passed to get_client (default: {('bigquery', 'storage')})
+        project {str} -- gcp project id (default: {None})
+        credentials {google.auth.credentials.Credentials} -- (default: {None} i.e. default credentials)
+        refresh_token {bool} -- if True, access token of google clients is fetched now instead of on first request (default: {True})
+
+    Returns:
+        dict -- service: client
+
+    Example:
+    # main.py of Cloud Function
+    from pyplatform.common.clients import warm_clients
+    warm_clients(['bigquery'])
+
+    def main(request):
+        ...
+
+    """
+    clients = {}
+    for service in services:
+        clients[service] = get_client(
+            service, project=project, credentials=credentials)
+        client_credentials = getattr(clients[service], '_credentials', None)
+        if refresh_token and client_credentials is not None and not client_credentials.valid:
+            try:
+                from google.auth.transport.requests import Request
+                client_credentials.refresh(Request())
+            except Exception as error:
+                logging.warning(
+                    f"access token of {service} client was not refreshed: {error}")
+    return clients
+
+
+def clear_clients(service=None):
+    """Drop clients of service or all services from registry e.g. after rotating credentials. Next get_client call builds new client.
+
+    Keyword Arguments:
+        service {str} -- service name, if None all clients are dropped (default: {None})
+    """
+    with _CLIENTS_LOCK:
+        for key in [key for key in _CLIENTS if service is None or key[1] == service]:
+            del _CLIENTS[key]
+
+
+def _credential_identity(service, credentials, kwargs):
+    """Return hashable identity of credentials used to build client.
+
+    Service account credentials are identified by email, project, subject and scopes, so equal credentials loaded twice share the client.
+    Other credentials are identified by the credentials object itself, which is kept alive by the key.
+    """
+    if service == 'azure_blob':
+        import hashlib
+        account_key = kwargs.get('account_key') or ''
+        return (kwargs.get('account_name'), hashlib.sha1(account_key.encode('utf-8')).hexdigest())
+    if credentials is None:
+        return ('default', os.environ.get('GOOGLE_APPLICATION_CREDENTIALS'))
+    email = getattr(credentials, 'service_account_email', None)
+    if email:
+        scopes = getattr(credentials, 'scopes', None) or ()
+        return (email, getattr(credentials, 'project_id', None), getattr(credentials, '_subject', None), tuple(sorted(scopes)))
+    return ('credentials', credentials)
+
+
+def _build_client(service, project=None, credentials=None, **kwargs):
+    """Build new client of service."""
+    if service == 'bigquery':
+        from google.cloud import bigquery
+        return bigquery.Client(project=project, credentials=credentials, **kwargs)
+    elif service == 'storage':
+        from google.cloud import storage
+        return storage.Client(project=project, credentials=credentials, **kwargs)
+    elif service == 'azure_blob':
+        from azure.storage.blob.blockblobservice import BlockBlobService
+        return BlockBlobService(**kwargs)
+    raise ValueError(
+        f"{service} is not supported, use one of 'bigquery', 'storage' or 'azure_blob'")
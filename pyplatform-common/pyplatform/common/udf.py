@@ -2,6 +2,7 @@ import pandas as pd
 import re
 import datetime
 import pytz
+import hashlib
 
 
 def sql_from_file(file_path):
@@ -19,6 +20,298 @@ def sql_from_file(file_path):
     return sql_script
 
 
+_SQL_TOKEN_PATTERN = re.compile(r"""
+    (?P<comment>--[^\n]*|\#[^\n]*|/\*.*?\*/)
+    |(?P<string>[rRbB]{0,2}(?:\'\'\'.*?\'\'\'|\"\"\".*?\"\"\"|'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"))
+    |(?P<identifier>`(?:\\.|[^`\\])*`)
+    |(?P<unterminated>/\*|\'\'\'|\"\"\"|['"`])
+    |(?P<word>[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<number>[0-9]+(?:\.[0-9]*)?(?:[eE][+-]?[0-9]+)?)
+    |(?P<semicolon>;)
+    |(?P<space>\s+)
+    |(?P<other>.)
+    """, re.VERBOSE | re.DOTALL)
+
+# keywords which open a block closed by END when they start a statement
+_SQL_BLOCK_STATEMENTS = {'IF', 'LOOP', 'WHILE', 'REPEAT', 'FOR'}
+# tokens after which a new statement starts inside a block
+_SQL_STATEMENT_START_AFTER = {';', ':', 'BEGIN', 'THEN', 'ELSE', 'DO', 'LOOP', 'REPEAT'}
+
+_SQL_SELECT_KEYWORDS = {'SELECT', 'WITH', '('}
+_SQL_DML_KEYWORDS = {'INSERT', 'UPDATE', 'DELETE', 'MERGE', 'TRUNCATE'}
+_SQL_DDL_KEYWORDS = {'CREATE', 'ALTER', 'DROP', 'UNDROP'}
+_SQL_SCRIPT_KEYWORDS = {'DECLARE', 'SET', 'CALL', 'BEGIN', 'IF', 'LOOP', 'WHILE', 'REPEAT', 'FOR', 'EXECUTE',
+                        'RAISE', 'RETURN', 'BREAK', 'LEAVE', 'CONTINUE', 'ITERATE', 'COMMIT', 'ROLLBACK'}
+
+_SQL_STATEMENT_TYPE_CACHE = {}
+_SQL_STATEMENT_TYPE_CACHE_SIZE = 1024
+
+
+def _sql_tokens(script):
+    """Return list of (token_type, text) tuples covering every character of script, including whitespace and comments."""
+    return [(match.lastgroup, match.group()) for match in _SQL_TOKEN_PATTERN.finditer(script)]
+
+
+def _sql_parse(script):
+    """Split script into top level statements with single pass over the tokens.
+
+    Semicolons inside string literals, comments, quoted identifiers and compound statements i.e. BEGIN...END, IF...END IF, LOOP...END LOOP,
+    WHILE...END WHILE, REPEAT...END REPEAT, FOR...END FOR and CASE...END expressions don't terminate a statement.
+
+    Returns:
+        tuple -- list of statements as lists of (token_type, text) tuples and bool flag set to False for unterminated strings, comments or blocks
+    """
+    tokens = _sql_tokens(script)
+    significant = [i for i, (kind, _) in enumerate(tokens)
+                   if kind not in ('space', 'comment')]
+    following = dict(zip(significant, significant[1:] + [None]))
+
+    statements = [[]]
+    blocks = []  # stack of open block keywords
+    previous = None  # previous significant token of current statement in upper case
+    well_formed = True
+
+    for i, (kind, text) in enumerate(tokens):
+        statements[-1].append((kind, text))
+        if kind in ('space', 'comment'):
+            continue
+        if kind == 'unterminated':
+            well_formed = False
+
+        token = text.upper()
+        if kind == 'word':
+            next_token = tokens[following[i]][1].upper(
+            ) if following[i] is not None else None
+            statement_start = previous is None or previous in _SQL_STATEMENT_START_AFTER
+
+            if token == 'BEGIN' and next_token not in ('TRANSACTION', ';', None):
+                blocks.append(token)
+            elif token == 'CASE' and previous != 'END':
+                blocks.append(token)
+            elif token in _SQL_BLOCK_STATEMENTS and statement_start and 'CASE' not in blocks[-1:]:
+                blocks.append(token)
+            elif token == 'END':
+                if blocks:
+                    blocks.pop()
+                else:
+                    well_formed = False
+
+        if kind == 'semicolon' and not blocks:
+            statements.append([])
+            previous = None
+        else:
+            previous = token
+
+    if blocks:
+        well_formed = False
+
+    statements = [statement for statement in statements
+                  if any(kind not in ('space', 'comment', 'semicolon') for kind, _ in statement)]
+    return statements, well_formed
+
+
+def _sql_join(statement):
+    """Return text of parsed statement without surrounding whitespace and terminating semi-colon."""
+    text = ''.join(text for _, text in statement).strip()
+    if statement and text.endswith(';'):
+        text = text[:-1].rstrip()
+    return text
+
+
+def sql_tokenize(script, keep_comments=False):
+    """Return tokens of bigquery sql script. Whitespace is dropped.
+
+    Arguments:
+        script {str} -- sql statement or series of sql statements delimited by semi-colon ";"
+
+    Keyword Arguments:
+        keep_comments {bool} -- if True, comments are returned as ``comment`` tokens (default: {False})
+
+    Returns:
+        list of tuple -- (token_type, text) where token_type is one of {'comment','string','identifier','word','number','semicolon','other','unterminated'}
+
+    Example:
+    sql_tokenize("SELECT 'a;b' AS col -- comment")
+    >>> [('word', 'SELECT'), ('string', "'a;b'"), ('word', 'AS'), ('word', 'col')]
+    """
+    skip = ('space',) if keep_comments else ('space', 'comment')
+    return [(kind, text) for kind, text in _sql_tokens(script) if kind not in skip]
+
+
+def sql_split_statements(script):
+    """Return list of sql statements in bigquery sql script.
+
+    Semicolons in string literals, comments and compound statements (BEGIN...END, IF...END IF, loops) don't split the script.
+
+    Arguments:
+        script {str} -- series of sql statements delimited by semi-colon ";"
+
+    Returns:
+        list of str -- statements without the terminating semi-colon
+    """
+    statements, _ = _sql_parse(script)
+    return [_sql_join(statement) for statement in statements]
+
+
+def sql_statement_type(script):
+    """Return statement type of bigquery sql script without calling bigquery api. Results are memoized by sha1 hash of the script.
+
+    Arguments:
+        script {str} -- sql statement, script or stored procedure call
+
+    Returns:
+        {str, None} -- {'SELECT','SCRIPT','DML','DDL'} or None if type can not be inferred with confidence e.g. EXPORT DATA, ASSERT
+            or unterminated strings and blocks, use bigquery dry run in that case
+
+    Example:
+    sql_statement_type("SELECT 1") # SELECT
+    sql_statement_type("DECLARE x INT64 DEFAULT 1; SELECT x") # SCRIPT
+    sql_statement_type("CALL `project_id.dataset.spoc_sample_superstore`()") # SCRIPT
+    """
+    sql_hash = hashlib.sha1(script.encode('utf-8')).hexdigest()
+    if sql_hash in _SQL_STATEMENT_TYPE_CACHE:
+        return _SQL_STATEMENT_TYPE_CACHE[sql_hash]
+
+    statements, well_formed = _sql_parse(script)
+
+    if not well_formed or not statements:
+        statement_type = None
+    elif len(statements) > 1:
+        statement_type = 'SCRIPT'
+    else:
+        first = [text.upper() for kind, text in statements[0]
+                 if kind not in ('space', 'comment')][0]
+        if first in _SQL_SELECT_KEYWORDS:
+            statement_type = 'SELECT'
+        elif first in _SQL_DML_KEYWORDS:
+            statement_type = 'DML'
+        elif first in _SQL_DDL_KEYWORDS:
+            statement_type = 'DDL'
+        elif first in _SQL_SCRIPT_KEYWORDS:
+            statement_type = 'SCRIPT'
+        else:
+            statement_type = None
+
+    if len(_SQL_STATEMENT_TYPE_CACHE) >= _SQL_STATEMENT_TYPE_CACHE_SIZE:
+        _SQL_STATEMENT_TYPE_CACHE.pop(next(iter(_SQL_STATEMENT_TYPE_CACHE)))
+    _SQL_STATEMENT_TYPE_CACHE[sql_hash] = statement_type
+    return statement_type
+
+
+def sql_normalize(script):
+    """Return sql script with comments removed and whitespace collapsed to single space. String literals are kept as is.
+
+    Arguments:
+        script {str} -- sql statement or series of sql statements
+
+    Returns:
+        str -- normalized sql e.g. for comparing or hashing queries
+    """
+    normalized = []
+    for kind, text in _sql_tokens(script):
+        if kind in ('space', 'comment'):
+            if normalized and normalized[-1] != ' ':
+                normalized.append(' ')
+        else:
+            normalized.append(text)
+    return ''.join(normalized).strip()
+
+
+def sql_referenced_tables(script):
+    """Return table ids referenced in FROM and JOIN clauses of SELECT statement. Common table expressions and UNNEST are ignored.
+
+    Arguments:
+        script {str} -- bigquery SELECT statement in standard SQL
+
+    Returns:
+        {list, None} -- list of table ids as written in the sql without backticks e.g. ['project_id.dataset.table_name']
+            or None if a reference can not be resolved locally e.g. table in default dataset, table function, parenthesized join
+            or any other FROM and JOIN form which isn't fully understood
+
+    Example:
+    sql_referenced_tables("SELECT * FROM `project_id.dataset.orders` o JOIN dataset.customers USING (id)")
+    >>> ['project_id.dataset.orders', 'dataset.customers']
+    sql_referenced_tables("SELECT * FROM p.d.a JOIN (p.d.b JOIN p.d.c USING(id)) USING(id)")
+    >>> None
+    """
+    name_kinds = ('word', 'identifier', 'number')
+    name_symbols = ('.', '-', '*')
+    clause_keywords = {'WHERE', 'JOIN', 'INNER', 'LEFT', 'RIGHT', 'FULL', 'CROSS', 'OUTER', 'ON', 'USING', 'GROUP', 'ORDER',
+                       'HAVING', 'QUALIFY', 'WINDOW', 'LIMIT', 'UNION', 'EXCEPT', 'INTERSECT', 'FOR', 'TABLESAMPLE', 'PIVOT',
+                       'UNPIVOT', 'SELECT'}
+    # tokens which may follow table reference and its alias
+    reference_end = clause_keywords | {',', ')', ';'}
+
+    tokens = [token for token in _sql_tokens(script) if token[0] != 'comment']
+    significant = [i for i, (kind, _) in enumerate(tokens) if kind != 'space']
+    upper = [tokens[i][1].upper() for i in significant]
+
+    cte_names = {upper[n] for n in range(len(upper) - 2)
+                 if upper[n + 1] == 'AS' and upper[n + 2] == '('}
+
+    def read_name(n):
+        """Return name made of adjacent tokens starting at significant token n and index of the next significant token."""
+        i = significant[n]
+        name = ''
+        while i < len(tokens) and (tokens[i][0] in name_kinds or tokens[i][1] in name_symbols):
+            name += tokens[i][1]
+            i += 1
+        next_n = n + 1
+        while next_n < len(significant) and significant[next_n] < i:
+            next_n += 1
+        return name, next_n
+
+    tables = []
+    parens = []  # token preceding each open parenthesis
+    n = 0
+    while n < len(significant):
+        token = upper[n]
+        previous = upper[n - 1] if n > 0 else None
+        if token == '(':
+            parens.append(previous)
+        elif token == ')' and parens:
+            parens.pop()
+        elif token in ('FROM', 'JOIN') and tokens[significant[n]][0] == 'word':
+            if token == 'FROM' and (parens[-1:] == ['EXTRACT'] or previous == 'DISTINCT'):
+                n += 1
+                continue  # EXTRACT(part FROM date), IS [NOT] DISTINCT FROM
+            n += 1
+            while n < len(significant):
+                if upper[n] == '(':
+                    first = n
+                    while first < len(significant) and upper[first] == '(':
+                        first += 1
+                    if first < len(significant) and upper[first] in ('SELECT', 'WITH'):
+                        break  # subquery
+                    return None  # parenthesized join
+                name, n = read_name(n)
+                if not name:
+                    return None
+                if n < len(significant) and upper[n] == '(':
+                    if name.upper() == 'UNNEST':
+                        break
+                    return None  # table function
+                if name.upper() not in cte_names:
+                    if '.' not in name.replace('`', ''):
+                        return None  # table in default dataset
+                    tables.append(name.replace('`', ''))
+                # skip alias and move on to comma separated cross join
+                if n < len(significant) and upper[n] == 'AS':
+                    n += 1
+                if n < len(significant) and upper[n] not in clause_keywords and tokens[significant[n]][0] in ('word', 'identifier'):
+                    n += 1
+                if n < len(significant) and upper[n] == ',':
+                    n += 1
+                elif n < len(significant) and upper[n] not in reference_end:
+                    return None
+                else:
+                    break
+            continue
+        n += 1
+
+    return list(dict.fromkeys(tables))
+
+
 def sql_get_params(script):
     """Return paramters of bigquery sql script.
 
@@ -28,14 +321,26 @@ def sql_get_params(script):
     Returns:
         list of str -- query parameters declared at top of script
     """
-    regex = re.compile('\s*DECLARE ([A-Za-z0-9_]*)', re.IGNORECASE)
-    lines = script.split(';')
-    return [re.findall(regex, param)[0] for param in lines if re.search(regex, param)]
+    params = []
+    statements, _ = _sql_parse(script)
+    for statement in statements:
+        tokens = [text for kind, text in statement
+                  if kind not in ('space', 'comment')]
+        if tokens[0].upper() == 'DECLARE':
+            # DECLARE name1[, name2 ...] [type] [DEFAULT value]
+            params.append(tokens[1])
+            for separator, name in zip(tokens[2::2], tokens[3::2]):
+                if separator != ',':
+                    break
+                params.append(name)
+    return params
 
 
 def sql_parameterize(script, params):
     """Inject script parameters values into bigquery sql script.
 
+    Parameters are replaced where they appear as names, not inside string literals, comments or longer names.
+
     Arguments:
         script {str} -- series of sql statements delimited by semi-colon ";", where parameters are declared at top and last statement is the main sql statement
         params {dict} -- parameter : values for the script
@@ -52,11 +357,12 @@ def sql_parameterize(script, params):
     print(sql)
     client.query(sql).to_dataframe() # get result as dataframe
     """
-    query = script.split(';')[-1]
-
-    substrings = sorted(params, key=len, reverse=True)
-    regex = re.compile('|'.join(map(re.escape, substrings)))
-    return regex.sub(lambda match: params[match.group(0)], query)
+    statements, _ = _sql_parse(script)
+    if not statements:
+        return ''
+    query = [(kind, params[text]) if kind == 'word' and text in params else (kind, text)
+             for kind, text in statements[-1]]
+    return _sql_join(query)
 
 
 def reportingMonthCurrent():
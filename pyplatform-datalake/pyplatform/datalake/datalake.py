@@ -6,8 +6,7 @@ import re
 import pandas as pd
 import datetime
 import pytz
-from google.cloud import storage
-from azure.storage.blob.blockblobservice import BlockBlobService
+from pyplatform.common.clients import get_client
 # TODO testing
 
 
@@ -24,7 +23,7 @@ def gcs_list_buckets(storage_client=None):
     if not storage_client:
         logging.debug(
             "instantiating storage client from defualt environment variable")
-        storage_client = storage.Client()
+        storage_client = get_client('storage')  # dependency
 
     list_of_buckets = [bucket.name for bucket in storage_client.list_buckets()]
 
@@ -49,7 +48,7 @@ def gcs_list_blobs(bucket_id=None, storage_client=None, folder_name=None, file_e
     if not storage_client:
         logging.debug(
             "instantiating storage client from defualt environment variable")
-        storage_client = storage.Client()
+        storage_client = get_client('storage')  # dependency
 
     if not bucket_id:
         bucket_id = os.environ.get("STORAGE_BUCKET")
@@ -158,7 +157,7 @@ def gcs_download_blob(gcs_uri, filepath=None, storage_client=None, output_option
     if not storage_client:
         logging.debug(
             "instantiating storage client from defualt environment variable")
-        storage_client = storage.Client()
+        storage_client = get_client('storage')  # dependency
 
     bucket = gcs_uri[5:].split('/')[0]
     blob = '/'.join(gcs_uri[5:].split('/')[1:])
@@ -217,7 +216,7 @@ def gcs_upload_blob(content, bucket_id=None, blobname=None, storage_client=None)
     if not storage_client:
         logging.debug(
             "instantiating storage client from defualt environment variable")
-        storage_client = storage.Client()
+        storage_client = get_client('storage')  # dependency
 
     if not bucket_id:
         bucket_id = os.environ.get("STORAGE_BUCKET")
@@ -257,7 +256,7 @@ def gcs_upload_folder(bucket_id=None, folderpath="./", output=True, storage_clie
     if not storage_client:
         logging.debug(
             "instantiating storage client from defualt environment variable")
-        storage_client = storage.Client()
+        storage_client = get_client('storage')  # dependency
 
     if not bucket_id:
         bucket_id = os.environ.get("STORAGE_BUCKET")
@@ -303,7 +302,7 @@ def gcs_del_storage_folder(bucket_id, folder=None, blob_name=None, storage_clien
     if not storage_client:
         logging.debug(
             "instantiating storage client from defualt environment variable")
-        storage_client = storage.Client()
+        storage_client = get_client('storage')  # dependency
 
     bucket = storage_client.bucket(bucket_id)
 
@@ -406,8 +405,8 @@ def azure_storage_download_blob(blob_url, account_key=None, filepath=None, outpu
     if not account_key:
         account_key = azure_get_credentials().get('account_key')  # dependency
 
-    service = BlockBlobService(
-        account_name=account_name, account_key=account_key)
+    service = get_client(
+        'azure_blob', account_name=account_name, account_key=account_key)  # dependency
     blob = service.get_blob_to_bytes(container_name, blob_name)
 
     if output_option == 'IO':
@@ -467,8 +466,8 @@ def azure_storage_upload_blob(content, blob_name=None, **credentials):
     container_name = credentials.get('container_name')
     account_key = credentials.get('account_key')
 
-    service = BlockBlobService(
-        account_name=account_name, account_key=account_key)
+    service = get_client(
+        'azure_blob', account_name=account_name, account_key=account_key)  # dependency
 
     if not blob_name:
         if os.path.isfile(content):
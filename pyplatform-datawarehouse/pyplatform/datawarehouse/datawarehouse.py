@@ -7,9 +7,16 @@ import datetime
 import pytz
 import json
 import io
+import hashlib
+import decimal
+import base64
+import itertools
+from pyplatform.common.udf import sql_statement_type, sql_normalize, sql_referenced_tables, sql_tokenize, sql_from_file
+from pyplatform.common.clients import get_client
 
 
-def bq_to_df(sql, client=None, **job_config):
+def bq_to_df(sql, client=None, engine='pandas', cache=False, return_all=False, bulk_export=None, max_bytes_processed=None, over_budget='raise',
+             **job_config):
     """Return bigquery query result as pandas.DataFrame.
 
     Arguments:
@@ -17,88 +24,696 @@ def bq_to_df(sql, client=None, **job_config):
 
     Keyword Arguments:
         client {bigquery.Client} -- defaults to client instantiated with default credentials
+        engine {str} -- {'pandas','arrow'} (default: {'pandas'})
+            'pandas' builds DataFrame with bigquery client library, NUMERIC columns are decimal.Decimal objects
+            'arrow' downloads result as pyarrow.Table, casts columns in arrow and hands over to pandas without copying each column,
+                NUMERIC columns are casted to float64. Use for wide or date heavy results.
+        cache {bool,str} -- if True or path to cache directory, SELECT statement result is stored on local disk and reused until
+            one of the referenced tables is modified. Directory defaults to env variable ``BQ_CACHE_DIR`` or ~/.cache/pyplatform/bq_to_df.
+            See bq_cache_stats() and bq_cache_clear() (default: {False})
+        return_all {bool} -- if True, returns result of every SELECT statement of a SCRIPT as dict of job_id: DataFrame in
+            statement order of the script. Results are downloaded concurrently. Ignores cache (default: {False})
+        bulk_export {bool} -- if True, result is exported to ``STORAGE_BUCKET`` env variable bucket as parquet shards and downloaded
+            concurrently with bq_export_to_df instead of paging through rest api. If None, switches to bulk export automatically when
+            result has at least ``BQ_EXPORT_MIN_ROWS`` (default 10,000,000) rows or ``BQ_EXPORT_MIN_BYTES`` (default 1,000,000,000) bytes
+            and ``STORAGE_BUCKET`` is set. If False, always pages through rest api (default: {None})
+        max_bytes_processed {int} -- byte budget checked with bq_dry_run before the query runs. Defaults to ``BQ_MAX_BYTES_PROCESSED``
+            env variable, no budget if neither is set (default: {None})
+        over_budget {str} -- {'raise','warn'} raises ValueError or logs warning and runs the query when dry run estimates more bytes
+            than max_bytes_processed (default: {'raise'})
         job_config {dict} -- keyword arguemnt for bigquery.job.QueryJobConfig
 
     Returns:
-        pandas.DataFrame -- query result as df
+        {pandas.DataFrame, dict} -- query result as df or dict of child job_id: df if return_all is True
 
     """
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
-
-    def get_date_columns(job):
-        """Return list of DATE columns from bigquery.job object."""
-        return [field.name for field in job.result().schema if field.field_type == 'DATE']
-
-    def transform_date(date_columns):
-        """Caste datetime.date to pd.datetime as pantab doesn't handle datetime.date objects."""
-        for col in date_columns:
-            df[col] = pd.to_datetime(df[col])
+        client = get_client('bigquery')  # dependency
 
     job_config = bigquery.QueryJobConfig(**job_config)
 
-    dry_run = bigquery.QueryJobConfig(
-        dry_run=True, use_query_cache=False)
-    job = client.query(sql, job_config=dry_run)
+    cache_key = None
+    if cache and not return_all:
+        cache_dir = cache if isinstance(cache, str) else None
+        cache_key = _bq_cache_key(sql, client, job_config, engine)
+        if cache_key:
+            df = _bq_cache_read(cache_key, cache_dir)
+            if df is not None:
+                logging.info(
+                    f"SELECT statement returned {len(df)} rows from cache")
+                return df
+
+    statement_type = sql_statement_type(sql)  # dependency
+    # float first, so env values in scientific notation e.g. 50e9 are accepted
+    max_bytes_processed = int(float(max_bytes_processed or os.environ.get(
+        'BQ_MAX_BYTES_PROCESSED') or 0))
+    if not statement_type or max_bytes_processed:
+        logging.debug(
+            "statement type could not be inferred from sql text, starting dry run" if not statement_type else "starting dry run for byte budget")
+        dry_run = bq_dry_run(sql, client=client,
+                             job_config=job_config)  # dependency
+        statement_type = statement_type or dry_run['statement_type']
+        if max_bytes_processed and dry_run['total_bytes_processed'] > max_bytes_processed:
+            message = f"query processes {dry_run['total_bytes_processed']/1e9:.2f} GB, budget is {max_bytes_processed/1e9:.2f} GB"
+            if over_budget == 'warn':
+                logging.warning(message)
+            else:
+                raise ValueError(message)
 
-    if job.statement_type == 'SELECT':
+    if statement_type == 'SELECT':
         job_id = create_bq_job_id(
             'adhoc SELECT Statment request')  # dependency
 
         job = client.query(sql, job_id=job_id, job_config=job_config)
-        # job.result()
-        df = job.to_dataframe()
+        df = _bq_result_to_df(job, client, engine=engine,
+                              bulk_export=bulk_export)
         # job_info = bq_get_job_info(job,client=client) #dependency
-        date_columns = get_date_columns(job)
+        if return_all:
+            logging.info(f"SELECT statement returned {len(df)} rows")
+            return {job.job_id: df}
 
-        if date_columns:
-            transform_date(date_columns)
-
-    elif job.statement_type == 'SCRIPT':
+    elif statement_type == 'SCRIPT':
         job_id = create_bq_job_id(
             'adhoc script request')  # dependency
         job = client.query(sql, job_id=job_id, job_config=job_config)
         job.result()
+        if return_all:
+            # every SELECT child including empty and single row results, bq_get_job_info LIST drops results with total_rows <= 1.
+            # list_jobs returns newest jobs first, children are sorted by creation time to follow statement order of the script
+            children = sorted(client.list_jobs(parent_job=job), key=lambda child: (
+                child.created is None, child.created or 0))
+            select_job_ids = [
+                child.job_id for child in children if child.statement_type == 'SELECT']
+            dfs = _bq_jobs_to_dfs(select_job_ids, client=client, engine=engine)
+            logging.info(
+                f"SCRIPT statement returned {len(dfs)} results with {sum(len(df) for df in dfs.values())} rows")
+            return dfs
+
         job_id = bq_get_job_info(job, client=client,
                                  output_option='LIST')  # dependency
 
         if len(job_id) == 1:
-            df = client.get_job(job_id[0]).to_dataframe()
+            df = _bq_result_to_df(client.get_job(
+                job_id[0]), client, engine=engine, bulk_export=bulk_export)
             # job_info = bq_get_job_info(job,client=client) #dependency
-            date_columns = get_date_columns(job)
-
-            if date_columns:
-                transform_date(date_columns)
 
         elif len(job_id) > 1:
-            df = client.get_job(job_id[-1]).to_dataframe()
+            df = _bq_result_to_df(client.get_job(
+                job_id[-1]), client, engine=engine, bulk_export=bulk_export)
             # job_info = bq_get_job_info(job,client=client) #dependency
             logging.warning(
                 " multi select stored procedure returns data for the last SELECT statement only")
-            date_columns = get_date_columns(job)
-
-            if date_columns:
-                transform_date(date_columns)
 
         else:
             logging.error(f"{sql} script did not return any data")
             df = None
     else:
         logging.error(
-            f"{job.statement_type} are not suppoted. Please provide a SELECT statement or a stored procedure containing SELECT statement")
+            f"{statement_type} are not suppoted. Please provide a SELECT statement or a stored procedure containing SELECT statement")
         return
         # job_info = bq_get_job_info(job,client=client) #dependency
         # logging.info(f"job execution detail: {job_info}")
     logging.info(f"{job.statement_type} statement returned {len(df)} rows")
 
+    if cache_key and df is not None:
+        _bq_cache_write(cache_key, df, cache_dir)
+
+    return df
+
+
+_BQ_CACHE_STATS = {'hits': 0, 'misses': 0, 'uncacheable': 0, 'evictions': 0}
+_BQ_CACHE_MAX_BYTES = 2 * 1024 ** 3
+# functions which make query result non-deterministic, bigquery doesn't cache these either
+_BQ_CACHE_NONDETERMINISTIC = {'CURRENT_DATE', 'CURRENT_DATETIME', 'CURRENT_TIME', 'CURRENT_TIMESTAMP', 'RAND',
+                              'GENERATE_UUID', 'SESSION_USER', 'NOW', 'INFORMATION_SCHEMA'}
+
+
+def _bq_cache_dir(cache_dir=None):
+    """Return directory of bq_to_df result cache, created if it doesn't exist."""
+    if not cache_dir:
+        cache_dir = os.environ.get('BQ_CACHE_DIR', os.path.join(
+            os.path.expanduser('~'), '.cache', 'pyplatform', 'bq_to_df'))
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def _bq_cache_key(sql, client, job_config, engine):
+    """Return cache key for SELECT statement from normalized sql, job config and ``modified`` timestamp of referenced tables.
+
+    Returns None if the result can't be cached safely i.e. scripts, views, external tables, wildcard tables, tables with streaming buffer,
+    tables which can't be resolved from the sql text and non-deterministic functions.
+    """
+    tables = sql_referenced_tables(sql) if sql_statement_type(
+        sql) == 'SELECT' else None  # dependency
+    words = {text.upper() for kind, text in sql_tokenize(sql)
+             if kind == 'word'}  # dependency
+    if tables is None or words & _BQ_CACHE_NONDETERMINISTIC:
+        logging.debug("query result is not cacheable")
+        _BQ_CACHE_STATS['uncacheable'] += 1
+        return None
+
+    modified = []
+    for table_id in sorted(tables):
+        try:
+            table = client.get_table(table_id)
+        except Exception as error:
+            logging.debug(f"query result is not cacheable: {error}")
+            _BQ_CACHE_STATS['uncacheable'] += 1
+            return None
+        if table.table_type != 'TABLE':
+            logging.debug(
+                f"query result is not cacheable: {table_id} is {table.table_type}")
+            _BQ_CACHE_STATS['uncacheable'] += 1
+            return None
+        if table.streaming_buffer is not None:
+            # streaming inserts don't update modified
+            logging.debug(
+                f"query result is not cacheable: {table_id} has streaming buffer")
+            _BQ_CACHE_STATS['uncacheable'] += 1
+            return None
+        modified.append(f"{table.full_table_id}@{table.modified.isoformat()}")
+
+    key = json.dumps([sql_normalize(sql), client.project, job_config.to_api_repr(), engine, modified],
+                     sort_keys=True, default=str)  # dependency
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _bq_cache_read(key, cache_dir=None):
+    """Return cached DataFrame for key read from memory mapped arrow file or None on cache miss."""
+    import pyarrow as pa
+
+    path = os.path.join(_bq_cache_dir(cache_dir), f"{key}.arrow")
+    if not os.path.isfile(path):
+        _BQ_CACHE_STATS['misses'] += 1
+        return None
+    try:
+        # memory map is released when the table and dataframe buffers are garbage collected
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        df = table.to_pandas(split_blocks=True)
+    except (pa.ArrowException, OSError) as error:
+        logging.warning(f"discarding unreadable cache file {path}: {error}")
+        _BQ_CACHE_STATS['misses'] += 1
+        return None
+    os.utime(path)  # mark as recently used
+    _BQ_CACHE_STATS['hits'] += 1
+    return df
+
+
+def _bq_cache_write(key, df, cache_dir=None):
+    """Write DataFrame to arrow IPC file and evict least recently used files above ``BQ_CACHE_MAX_BYTES`` env variable."""
+    import pyarrow as pa
+
+    cache_dir = _bq_cache_dir(cache_dir)
+    path = os.path.join(cache_dir, f"{key}.arrow")
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(temp_path, 'wb') as sink:
+            writer = pa.ipc.new_file(sink, table.schema)
+            writer.write_table(table)
+            writer.close()
+        os.replace(temp_path, path)
+    except (pa.ArrowException, OSError) as error:
+        logging.warning(f"query result was not cached: {error}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return
+
+    max_bytes = int(os.environ.get('BQ_CACHE_MAX_BYTES', _BQ_CACHE_MAX_BYTES))
+    files = []
+    for name in os.listdir(cache_dir):
+        if name.endswith('.arrow'):
+            try:  # other processes sharing the cache directory may evict files concurrently
+                stat = os.stat(os.path.join(cache_dir, name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size,
+                          os.path.join(cache_dir, name)))
+    total_bytes = 0
+    for _, size, file in sorted(files, reverse=True):
+        total_bytes += size
+        if total_bytes > max_bytes and file != path:
+            try:
+                os.remove(file)
+            except OSError:
+                continue
+            _BQ_CACHE_STATS['evictions'] += 1
+            logging.debug(f"evicted {file} from cache")
+
+
+def bq_cache_stats(cache_dir=None):
+    """Return statistics of bq_to_df result cache.
+
+    Keyword Arguments:
+        cache_dir {str} -- cache directory (default: env variable ``BQ_CACHE_DIR`` or ~/.cache/pyplatform/bq_to_df)
+
+    Returns:
+        dict -- hits, misses, uncacheable queries and evictions in current process, number of entries and size_MB on disk
+    """
+    cache_dir = _bq_cache_dir(cache_dir)
+    files = [os.path.join(cache_dir, name) for name in os.listdir(
+        cache_dir) if name.endswith('.arrow')]
+    stats = dict(_BQ_CACHE_STATS)
+    stats['entries'] = len(files)
+    stats['size_MB'] = sum(os.path.getsize(file) for file in files)/1000000
+    return stats
+
+
+def bq_cache_clear(cache_dir=None):
+    """Delete all cached bq_to_df results.
+
+    Keyword Arguments:
+        cache_dir {str} -- cache directory (default: env variable ``BQ_CACHE_DIR`` or ~/.cache/pyplatform/bq_to_df)
+    """
+    cache_dir = _bq_cache_dir(cache_dir)
+    for name in os.listdir(cache_dir):
+        if name.endswith('.arrow'):
+            os.remove(os.path.join(cache_dir, name))
+    logging.debug(f"cleared cache in {cache_dir}")
+
+
+def _bq_jobs_to_dfs(job_ids, client, engine='pandas', max_workers=8):
+    """Download results of completed query jobs concurrently on a thread pool.
+
+    Arguments:
+        job_ids {list} -- job_ids of completed query jobs e.g. SELECT children of SCRIPT job from bq_get_job_info(job, output_option='LIST')
+        client {bigquery.Client}
+
+    Keyword Arguments:
+        engine {str} -- {'pandas','arrow', None} see bq_to_df, None returns bigquery.table.RowIterator.to_dataframe() as is (default: {'pandas'})
+        max_workers {int} -- maximum number of concurrent downloads (default: {8})
+
+    Returns:
+        dict -- job_id: pandas.DataFrame in the order of job_ids
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def fetch(job_id):
+        rows = client.get_job(job_id).result()
+        return rows.to_dataframe() if engine is None else _rows_to_df(rows, engine=engine)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(job_ids)))) as executor:
+        dfs = list(executor.map(fetch, job_ids))
+    return dict(zip(job_ids, dfs))
+
+
+_BQ_EXPORT_MIN_ROWS = 10 ** 7
+_BQ_EXPORT_MIN_BYTES = 10 ** 9
+_BQ_EXPORT_CHECK_ROWS = 100000  # smaller results are paged without looking up result size
+
+
+def _bq_result_to_df(job, client, engine='pandas', bulk_export=None):
+    """Return result of completed query job as DataFrame, with bulk export for large results. See bq_to_df bulk_export."""
+    rows = job.result()
+    if bulk_export is False:
+        return _rows_to_df(rows, engine=engine)
+
+    staging_bucket = os.environ.get('STORAGE_BUCKET')
+    if not staging_bucket:
+        if bulk_export:
+            raise ValueError(
+                "bulk_export requires STORAGE_BUCKET env variable for staging the export")
+        return _rows_to_df(rows, engine=engine)
+
+    if not bulk_export and (rows.total_rows or 0) >= _BQ_EXPORT_CHECK_ROWS:
+        if rows.total_rows >= int(os.environ.get('BQ_EXPORT_MIN_ROWS', _BQ_EXPORT_MIN_ROWS)):
+            bulk_export = True
+        else:
+            num_bytes = _bq_get_table(job.destination, client).num_bytes  # dependency
+            bulk_export = (num_bytes or 0) >= int(
+                os.environ.get('BQ_EXPORT_MIN_BYTES', _BQ_EXPORT_MIN_BYTES))
+
+    if bulk_export:
+        logging.debug(
+            f"exporting {rows.total_rows} rows of {job.job_id} to gs://{staging_bucket}")
+        return bq_export_to_df(_bq_table_id(job.destination), client=client, engine=engine, staging_bucket=staging_bucket)
+    return _rows_to_df(rows, engine=engine)
+
+
+def bq_export_to_df(table_id, client=None, engine='pandas', output_option='DF', format='PARQUET', staging_bucket=None, storage_client=None, max_workers=8):
+    """Return bigquery table as pandas.DataFrame or pyarrow.Table by exporting it to gcs shards and downloading them concurrently.
+
+    Faster than paging through rest api for large tables or query results e.g. destination of query job. Staged shards are deleted
+    after download.
+
+    Arguments:
+        table_id {str} -- fully qualified table id e.g. project_id.dataset.table_name
+
+    Keyword Arguments:
+        client {bigquery.Client} -- defaults to client instantiated with default credentials
+        engine {str} -- {'pandas','arrow'} see bq_to_df (default: {'pandas'})
+        output_option {str} -- {'DF','ARROW'} 'ARROW' returns pyarrow.Table (default: {'DF'})
+        format {str} -- {'PARQUET','AVRO'} format of exported shards, AVRO requires fastavro package (default: {'PARQUET'})
+        staging_bucket {str} -- gcs bucket name for export shards (default: env variable ``STORAGE_BUCKET``)
+        storage_client {google.storage.Client} -- storage client for staging_bucket (default: {None})
+        max_workers {int} -- maximum number of concurrent shard downloads (default: {8})
+
+    Returns:
+        {pandas.DataFrame, pyarrow.Table}
+
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if not client:
+        logging.debug(
+            "instantiating bigquery client from defualt environment variable")
+        client = get_client('bigquery')  # dependency
+    if not storage_client:
+        logging.debug(
+            "instantiating storage client from defualt environment variable")
+        storage_client = get_client('storage')  # dependency
+    staging_bucket = staging_bucket or os.environ.get('STORAGE_BUCKET')
+    format = format.upper()
+
+    prefix = f"bigquery_staging/{create_bq_job_id('bq_export_to_df')}"  # dependency
+    extension = '.avro' if format == 'AVRO' else '.parquet'
+    job_config = {'use_avro_logical_types': True} if format == 'AVRO' else {}
+    export_job = bq_export_csv_to_gcs(table_id, staging_bucket, client=client, destination_uri=f"gs://{staging_bucket}/{prefix}/shard_*{extension}",
+                                      destination_format=format, **job_config)  # dependency
+
+    def fetch(blob):
+        data = blob.download_as_bytes() if hasattr(
+            blob, 'download_as_bytes') else blob.download_as_string()
+        if format == 'AVRO':
+            import fastavro
+            return pd.DataFrame.from_records(list(fastavro.reader(io.BytesIO(data))))
+        return pq.read_table(io.BytesIO(data))
+
+    blobs = []
+    try:
+        export_job.result()
+        blobs = sorted(storage_client.list_blobs(staging_bucket, prefix=f"{prefix}/"),
+                       key=lambda blob: blob.name)
+        logging.debug(
+            f"downloading {len(blobs)} shards of {table_id} from gs://{staging_bucket}/{prefix}")
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(blobs)))) as executor:
+            shards = list(executor.map(fetch, blobs))
+    finally:
+        if blobs:
+            storage_client.bucket(staging_bucket).delete_blobs(blobs)
+
+    schema = _bq_get_table(table_id, client).schema  # dependency
+    if format == 'AVRO':
+        df = pd.concat(shards, ignore_index=True) if shards else pd.DataFrame(
+            columns=[field.name for field in schema])
+        return pa.Table.from_pandas(df, preserve_index=False) if output_option == 'ARROW' else df
+
+    table = pa.concat_tables(shards)
+    if output_option == 'ARROW':
+        return table
+    if engine == 'arrow':
+        return _arrow_to_df(table, schema)
+    df = table.to_pandas()
+    for field in schema:
+        if field.field_type == 'DATE':
+            df[field.name] = pd.to_datetime(df[field.name])
     return df
 
 
-def bq_to_df_with_json_objects(sql=None, job_id=None, client=None, output_option='DF', json_file_name=None):
+def _rows_to_df(rows, engine='pandas'):
+    """Return bigquery.table.RowIterator as pandas.DataFrame with DATE columns casted to datetime64.
+
+    Column types are taken from ``rows.schema`` of the completed job, no additional api call is made.
+
+    Arguments:
+        rows {bigquery.table.RowIterator} -- result of bigquery.job.QueryJob.result()
+
+    Keyword Arguments:
+        engine {str} -- {'pandas','arrow'} see bq_to_df (default: {'pandas'})
+
+    Returns:
+        pandas.DataFrame
+    """
+    if engine == 'arrow':
+        return _arrow_to_df(rows.to_arrow(), rows.schema)
+
+    df = rows.to_dataframe()
+    for field in rows.schema:
+        if field.field_type == 'DATE':
+            # caste datetime.date to pd.datetime as pantab doesn't handle datetime.date objects
+            df[field.name] = pd.to_datetime(df[field.name])
+    return df
+
+
+def _arrow_to_df(table, schema):
+    """Cast NUMERIC columns of pyarrow.Table to float64 and convert table to pandas.DataFrame.
+
+    DATE and TIMESTAMP columns are converted to datetime64 by pyarrow in a single vectorized pass. Columns are converted to separate
+    pandas blocks to avoid consolidating (copying) them into one 2D array.
+
+    Arguments:
+        table {pyarrow.Table} -- result of bigquery.table.RowIterator.to_arrow()
+        schema {list} -- list of bigquery.schema.SchemaField of the table
+
+    Returns:
+        pandas.DataFrame
+    """
+    import pyarrow as pa
+
+    numeric_columns = [field.name for field in schema if field.field_type in (
+        'NUMERIC', 'BIGNUMERIC') and field.mode != 'REPEATED']
+    for name in numeric_columns:
+        index = table.schema.get_field_index(name)
+        try:
+            column = table.column(index).cast(pa.float64())
+        except (pa.ArrowNotImplementedError, pa.ArrowInvalid) as error:
+            logging.debug(f"{name} is kept as decimal: {error}")
+            continue
+        table = table.set_column(index, name, column)
+
+    return table.to_pandas(date_as_object=False, split_blocks=True)
+
+
+_BQ_DRY_RUN_CACHE = {}  # sha256 of project, sql and job config: (dry run monotonic time, result)
+_BQ_DRY_RUN_CACHE_TTL = 300
+
+
+def bq_dry_run(sql, client=None, job_config=None, max_age=None):
+    """Dry run sql and return estimated bytes processed without running the query. Results are cached by hash of sql text.
+
+    Arguments:
+        sql {str} -- bigquery statement in standard SQL
+
+    Keyword Arguments:
+        client {bigquery.Client} -- defaults to client instantiated with default credentials
+        job_config {bigquery.QueryJobConfig} -- query parameters and default dataset of the query (default: {None})
+        max_age {float} -- seconds a cached dry run is reused, 0 always dry runs. Defaults to ``BQ_DRY_RUN_CACHE_TTL`` env variable or 300 (default: {None})
+
+    Returns:
+        dict -- statement_type {str}, total_bytes_processed {int} and referenced_tables {list}
+
+    Raises:
+        google.api_core.exceptions.BadRequest -- if sql is invalid
+
+    """
+    import time
+
+    if not client:
+        logging.debug(
+            "instantiating bigquery client from defualt environment variable")
+        client = get_client('bigquery')  # dependency
+
+    dry_run = _copy_job_config(job_config) if job_config else bigquery.QueryJobConfig()
+    dry_run.dry_run = True
+    dry_run.use_query_cache = False
+    key = hashlib.sha256(json.dumps([client.project, sql, dry_run.to_api_repr()], sort_keys=True,
+                                    default=str).encode('utf-8')).hexdigest()
+    if max_age is None:
+        max_age = float(os.environ.get(
+            'BQ_DRY_RUN_CACHE_TTL', _BQ_DRY_RUN_CACHE_TTL))
+
+    cached = _BQ_DRY_RUN_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < max_age:
+        return dict(cached[1])
+
+    job = client.query(sql, job_config=dry_run)
+    result = {'statement_type': job.statement_type, 'total_bytes_processed': job.total_bytes_processed or 0,
+              'referenced_tables': [_bq_table_id(table) for table in job.referenced_tables or []]}
+    logging.debug(
+        f"dry run estimated {result['total_bytes_processed']/1e9:.2f} GB processed")
+    _BQ_DRY_RUN_CACHE[key] = (time.monotonic(), result)
+    return dict(result)
+
+
+def bq_validate_sql_files(folder, client=None, pattern='*.sql', recursive=False, max_bytes_processed=None, max_workers=8):
+    """Dry run every sql file in folder concurrently and report validity and bytes processed per file e.g. in CI before deploying queries.
+
+    Arguments:
+        folder {str} -- path to folder with sql files read with sql_from_file
+
+    Keyword Arguments:
+        client {bigquery.Client} -- defaults to client instantiated with default credentials
+        pattern {str} -- glob pattern of sql files (default: {'*.sql'})
+        recursive {bool} -- if True, sql files of sub folders are validated too (default: {False})
+        max_bytes_processed {int} -- files estimated to process more bytes are flagged over_budget. Defaults to ``BQ_MAX_BYTES_PROCESSED``
+            env variable (default: {None})
+        max_workers {int} -- maximum number of concurrent dry runs (default: {8})
+
+    Returns:
+        pandas.DataFrame -- file, valid, statement_type, GB_processed, over_budget and error per file sorted by GB_processed
+
+    Example:
+    report = bq_validate_sql_files('./sql', max_bytes_processed=100e9)
+    assert report.valid.all() and not report.over_budget.any()
+
+    """
+    import glob
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not client:
+        logging.debug(
+            "instantiating bigquery client from defualt environment variable")
+        client = get_client('bigquery')  # dependency
+
+    # float first, so env values in scientific notation e.g. 50e9 are accepted
+    max_bytes_processed = int(float(max_bytes_processed or os.environ.get(
+        'BQ_MAX_BYTES_PROCESSED') or 0))
+    files = sorted(glob.glob(os.path.join(folder, '**', pattern) if recursive else os.path.join(folder, pattern),
+                             recursive=recursive))
+
+    def validate(file_path):
+        try:
+            dry_run = bq_dry_run(sql_from_file(file_path),
+                                 client=client)  # dependency
+        except Exception as error:
+            return {'file': file_path, 'valid': False, 'statement_type': None, 'GB_processed': None, 'over_budget': False,
+                    'error': str(getattr(error, 'message', error))}
+        return {'file': file_path, 'valid': True, 'statement_type': dry_run['statement_type'],
+                'GB_processed': dry_run['total_bytes_processed']/1e9,
+                'over_budget': bool(max_bytes_processed) and dry_run['total_bytes_processed'] > max_bytes_processed, 'error': None}
+
+    report = []
+    if files:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as executor:
+            report = list(executor.map(validate, files))
+    logging.info(
+        f"{len(files)} sql files validated, {sum(not row['valid'] for row in report)} invalid and {sum(row['over_budget'] for row in report)} over budget")
+
+    return pd.DataFrame(report, columns=['file', 'valid', 'statement_type', 'GB_processed', 'over_budget', 'error']).sort_values(
+        'GB_processed', ascending=False, na_position='first').reset_index(drop=True)
+
+
+def bq_to_df_iter(sql, page_size=100000, prefetch=1, client=None, **job_config):
+    """Yield bigquery query result as pandas.DataFrame chunks, one chunk per result page.
+
+    Next page is downloaded in a background thread while current chunk is processed. At most ``prefetch`` pages are held in memory
+    in addition to the current chunk, so memory stays flat regardless of result size.
+
+    Arguments:
+        sql {str} -- bigquery SELECT statement in standard SQL or stored procedure containing SELECT statement
+
+    Keyword Arguments:
+        page_size {int} -- maximum number of rows per chunk (default: {100000})
+        prefetch {int} -- number of pages downloaded ahead of the caller, 0 disables background download (default: {1})
+        client {bigquery.Client} -- defaults to client instantiated with default credentials
+        job_config {dict} -- keyword arguemnt for bigquery.job.QueryJobConfig
+
+    Yields:
+        pandas.DataFrame -- chunk of query result with DATE columns casted to datetime64
+
+    Example:
+    for df in bq_to_df_iter(sql, page_size=50000):
+        df_to_bq(df, table_id).result()
+    """
+    if not client:
+        logging.debug(
+            "instantiating bigquery client from defualt environment variable")
+        client = get_client('bigquery')  # dependency
+
+    job_config = bigquery.QueryJobConfig(**job_config)
+    job_id = create_bq_job_id(
+        'adhoc chunked SELECT Statment request')  # dependency
+    job = client.query(sql, job_id=job_id, job_config=job_config)
+    rows = job.result(page_size=page_size)
+
+    column_names = [field.name for field in rows.schema]
+    date_columns = [
+        field.name for field in rows.schema if field.field_type == 'DATE']
+
+    def page_to_df(page):
+        """Create DataFrame from page of bigquery.table.Row and caste DATE columns to datetime64."""
+        df = pd.DataFrame.from_records(
+            [row.values() for row in page], columns=column_names)
+        for col in date_columns:
+            df[col] = pd.to_datetime(df[col])
+        return df
+
+    chunks = (page_to_df(page) for page in rows.pages)
+    num_rows = 0
+    for df in _prefetch_iterator(chunks, prefetch):
+        num_rows += len(df)
+        yield df
+    logging.info(f"{job.statement_type} statement returned {num_rows} rows")
+
+
+def _prefetch_iterator(iterable, prefetch=1):
+    """Iterate over iterable in a background thread, keeping up to ``prefetch`` items ready ahead of the caller.
+
+    Exceptions raised by the iterable are re-raised in the caller's thread. If the caller stops early, background thread stops
+    after its current item.
+
+    Arguments:
+        iterable {iterable} -- e.g. generator downloading result pages
+
+    Keyword Arguments:
+        prefetch {int} -- maximum number of items buffered ahead of the caller, 0 iterates in caller's thread (default: {1})
+
+    Yields:
+        items of iterable
+    """
+    import threading
+    import queue
+
+    if prefetch < 1:
+        yield from iterable
+        return
+
+    buffer = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    done = object()  # sentinel for end of iterable
+
+    def put(item):
+        """Put item in buffer unless caller has stopped iterating."""
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def producer():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except Exception as error:
+            put((done, error))
+
+    thread = threading.Thread(target=producer, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def bq_to_df_with_json_objects(sql=None, job_id=None, client=None, output_option='DF', json_file_name=None, lines=False, compression=None):
     """Return nested and repeated fields as pandas.DataFrame, JSON string or json file either from sql SELECT statement or job_id.
 
+    FILE, IO and JSON outputs are encoded page by page as rows are downloaded, rows are not held in memory.
+
     Keyword Arguments:
         sql {str} -- bigquery SELECT statement in standard SQL
         job_id {str} -- custom job_id for select statement. If result of completed job is needed, sql statement should be omitted to get result by job_id
@@ -107,12 +722,14 @@ def bq_to_df_with_json_objects(sql=None, job_id=None, client=None, output_option
             DF => pandas.dataframe
             FILE => json file in current working directory
             JSON => json string
-            IO => io.StringIO
+            IO => io.StringIO or io.BytesIO if compression is gzip
 
         json_file_name {str} -- optional filename if FILE output is choosen (default: {Result_YYYYMMDD_HHMMSS_EST.json})
+        lines {bool} -- if True, FILE and IO are written as newline delimited json i.e. one row per line, otherwise as json array (default: {False})
+        compression {str} -- {None, 'gzip'} compresses FILE and IO output on the fly (default: {None})
 
     Returns:
-        pandas.DataFrame|JSON|filename
+        pandas.DataFrame|JSON|filename|io
 
     Example:
 
@@ -121,41 +738,105 @@ def bq_to_df_with_json_objects(sql=None, job_id=None, client=None, output_option
     bq_to_df_with_json_objects(sql) # returns dataframe
     bq_to_df_with_json_objects(script_job_id,'JSON') # returns JSON object from Script statmente job_id
     bq_to_df_with_json_objects(sql, output_option='FILE', json_file_name='dowlonad_jsonfile.json'), dowloaded to file 
+    bq_to_df_with_json_objects(sql, output_option='FILE', lines=True, compression='gzip'), dowloaded to result_YYYYMMDD_HHMMSS_EST.json.gz
     """
+    import gzip
+
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
-
-    def datetime_transformer(obj):
-        """Caste datetime.date and datetime.datetime object to iso string."""
-        if isinstance(obj, datetime.datetime) or isinstance(obj, datetime.date):
-            return obj.isoformat()
+        client = get_client('bigquery')  # dependency
 
     if job_id and not sql:
         query_job = client.get_job(job_id)
     else:
         query_job = client.query(sql, job_id=job_id)
 
-    records = [dict(row) for row in query_job]
+    rows = query_job.result()
     if not json_file_name:
         ts_str = datetime.datetime.now(pytz.timezone(
             'America/New_York')).strftime('%Y%m%d_%H%M%S_EST')
         json_file_name = f'result_{ts_str}.json'
+        if compression == 'gzip':
+            json_file_name += '.gz'
 
     if output_option == 'FILE':
-        with open(json_file_name, mode='w') as file:
-            json.dump(records, file, default=datetime_transformer)
+        if compression == 'gzip':
+            file = gzip.open(json_file_name, mode='wt', encoding='utf-8')
+        else:
+            file = open(json_file_name, mode='w', encoding='utf-8')
+        with file:
+            num_rows = _write_json_rows(rows, file, lines=lines)
+        logging.debug(f"{num_rows} rows written to {json_file_name}")
         return json_file_name
     elif output_option == 'IO':
-        in_mem_file = io.StringIO()
-        json.dump(records, in_mem_file, default=datetime_transformer)
+        if compression == 'gzip':
+            in_mem_file = io.BytesIO()
+            with gzip.GzipFile(fileobj=in_mem_file, mode='wb') as gzip_file, io.TextIOWrapper(gzip_file, encoding='utf-8') as file:
+                _write_json_rows(rows, file, lines=lines)
+        else:
+            in_mem_file = io.StringIO()
+            _write_json_rows(rows, in_mem_file, lines=lines)
         in_mem_file.seek(0)
         return in_mem_file
     elif output_option == 'JSON':
-        return json.dumps({"data": records}, default=datetime_transformer)
+        in_mem_file = io.StringIO()
+        in_mem_file.write('{"data": ')
+        _write_json_rows(rows, in_mem_file)
+        in_mem_file.write('}')
+        return in_mem_file.getvalue()
     else:
-        return pd.DataFrame(records)
+        return pd.DataFrame([dict(row) for row in rows])
+
+
+def _json_default(obj):
+    """Caste datetime, date, time, Decimal and bytes objects of bigquery rows to json serializable values."""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    elif isinstance(obj, decimal.Decimal):
+        return float(obj)
+    elif isinstance(obj, bytes):
+        return base64.b64encode(obj).decode('ascii')
+    raise TypeError(
+        f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_JSON_ENCODER = json.JSONEncoder(
+    default=_json_default, ensure_ascii=False, check_circular=False)
+
+
+def _write_json_rows(rows, file, lines=False):
+    """Encode bigquery rows page by page and write to text file object. Next page is downloaded while current page is written.
+
+    Arguments:
+        rows {bigquery.table.RowIterator} -- result of bigquery.job.QueryJob.result()
+        file {io.TextIOBase} -- writable text file object
+
+    Keyword Arguments:
+        lines {bool} -- if True, writes newline delimited json, otherwise json array (default: {False})
+
+    Returns:
+        int -- number of rows written
+    """
+    encode = _JSON_ENCODER.encode
+    num_rows = 0
+    if not lines:
+        file.write('[')
+    for page in _prefetch_iterator(rows.pages):  # dependency
+        chunk = [encode(dict(row.items())) for row in page]
+        if not chunk:
+            continue
+        if lines:
+            file.write('\n'.join(chunk))
+            file.write('\n')
+        else:
+            if num_rows:
+                file.write(', ')
+            file.write(', '.join(chunk))
+        num_rows += len(chunk)
+    if not lines:
+        file.write(']')
+    return num_rows
 
 
 def bq_result_to_table(sql, destination_table_id, write_mode='WRITE_APPEND', client=None, **job_config):
@@ -174,7 +855,7 @@ def bq_result_to_table(sql, destination_table_id, write_mode='WRITE_APPEND', cli
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
     job_config = bigquery.QueryJobConfig(**job_config)
     job_config.write_disposition = write_mode
@@ -187,10 +868,183 @@ def bq_result_to_table(sql, destination_table_id, write_mode='WRITE_APPEND', cli
         sql,
         job_config=job_config, job_id=job_id)
 
-    return job
+    return _bq_table_cache_track(job, destination_table_id, client)
 
 
-def bq_to_excel(sql, filepath=None, sheet_name=None, index=False, mode='w', client=None, output_option='FILE'):
+def bq_jobs_as_completed(job_specs, max_concurrent=10, client=None, poll_interval=1.0, timeout=None):
+    """Start bigquery jobs with at most max_concurrent jobs running and yield them as they complete.
+
+    Job status is polled in batches, each poll lists jobs completed since creation of the oldest running job with list_jobs
+    instead of blocking on result() of each job. Jobs of other projects than client's project, jobs without creation time and
+    jobs not confirmed by list_jobs after ``_BQ_JOB_LIST_POLLS`` polls e.g. jobs of other principals are reloaded one by one.
+
+    Arguments:
+        job_specs {list} -- zero argument callables starting a job e.g. functools.partial(bq_result_to_table, sql, table_id)
+            or lambda: bq_copy_table(source, destination), already started jobs are accepted as well. Callables returning
+            anything other than a job e.g. summary of chunked df_to_bq are yielded as completed right away, dict with non-empty
+            errors is yielded as failed
+
+    Keyword Arguments:
+        max_concurrent {int} -- maximum number of running jobs (default: {10})
+        client {bigquery.Client} -- client used for polling (default: client instantiated with default credentials)
+        poll_interval {float} -- seconds between polls (default: {1.0})
+        timeout {float} -- seconds, raises TimeoutError if jobs are still running (default: {None})
+
+    Yields:
+        tuple -- (index of job spec, job or result of callable or None, error message or None)
+
+    Example:
+    from functools import partial
+    specs = [partial(bq_result_to_table, sql, table_id, write_mode='WRITE_TRUNCATE') for sql, table_id in refreshes]
+    for index, job, error in bq_jobs_as_completed(specs, max_concurrent=20):
+        print(index, job.job_id, error)
+
+    """
+    import time
+    from collections import deque
+
+    if not client:
+        logging.debug(
+            "instantiating bigquery client from defualt environment variable")
+        client = get_client('bigquery')  # dependency
+
+    pending = deque(enumerate(job_specs))
+    running = {}  # job_id: (index, job)
+    unconfirmed = {}  # job_id: number of polls list_jobs didn't confirm the job as done
+    deadline = time.monotonic() + timeout if timeout else None
+
+    while pending or running:
+        while pending and len(running) < max_concurrent:
+            index, spec = pending.popleft()
+            try:
+                job = spec() if callable(spec) else spec
+            except Exception as error:
+                logging.error(f"job spec {index} failed to start: {error}")
+                yield index, None, str(error)
+                continue
+            if not hasattr(job, 'job_id') or not hasattr(job, 'reload'):
+                errors = job.get('errors') if isinstance(job, dict) else None
+                error = '; '.join(str(error.get('message', error)) if isinstance(error, dict) else str(error)
+                                  for error in errors) if errors else None
+                if error:
+                    logging.error(f"job spec {index} failed: {error}")
+                yield index, job, error
+                continue
+            running[job.job_id] = (index, job)
+
+        if not running:
+            continue
+        if deadline and time.monotonic() > deadline:
+            raise TimeoutError(
+                f"{len(running)} jobs still running and {len(pending)} not started after {timeout} seconds")
+        time.sleep(poll_interval)
+
+        for job_id in _bq_done_job_ids(running, client, unconfirmed):
+            index, job = running.pop(job_id)
+            if job.state != 'DONE':
+                job.reload()
+            error = job.error_result.get('message') if job.error_result else None
+            if error:
+                logging.error(f"job {job_id} failed: {error}")
+            yield index, job, error
+
+
+_BQ_JOB_LIST_POLLS = 5  # polls after which a job not confirmed by list_jobs is reloaded
+_BQ_JOB_LIST_PAGES = 2  # pages of list_jobs read per poll, jobs not found within them are reloaded
+_BQ_JOB_LIST_PAGE_SIZE = 100
+
+
+def _bq_done_job_ids(running, client, unconfirmed):
+    """Return job_ids of running jobs which are done.
+
+    Jobs of client's project are looked up with list_jobs of jobs done since creation of the oldest of them, listing stops as soon as
+    all of them are found or after _BQ_JOB_LIST_PAGES pages. Jobs already in DONE state are done, other jobs, jobs not reached within
+    the listed pages and jobs list_jobs didn't confirm for _BQ_JOB_LIST_POLLS polls are reloaded.
+
+    Arguments:
+        running {dict} -- job_id: (index, job)
+        client {bigquery.Client}
+        unconfirmed {dict} -- job_id: number of polls, updated in place
+    """
+    done = []
+    listed = {job_id: job for job_id, (_, job) in running.items()
+              if job.state != 'DONE' and getattr(job, 'created', None) is not None
+              and getattr(job, 'project', client.project) == client.project}
+    try:
+        if listed:
+            since = min(job.created for job in listed.values()) - \
+                datetime.timedelta(seconds=1)
+            remaining = set(listed)
+            pages = client.list_jobs(min_creation_time=since, state_filter='done',
+                                     page_size=_BQ_JOB_LIST_PAGE_SIZE).pages
+            for page_number, page in enumerate(pages, 1):
+                for job in page:
+                    if job.job_id in remaining:
+                        done.append(job.job_id)
+                        remaining.discard(job.job_id)
+                if not remaining:
+                    break
+                if page_number >= _BQ_JOB_LIST_PAGES:
+                    # listing is truncated, remaining jobs may be done beyond listed pages
+                    listed = {job_id: job for job_id, job in listed.items()
+                              if job_id not in remaining}
+                    break
+    except Exception as error:
+        logging.debug(f"list_jobs failed, reloading jobs one by one: {error}")
+        listed = {}
+
+    for job_id, (_, job) in running.items():
+        if job_id in done:
+            unconfirmed.pop(job_id, None)
+            continue
+        if job.state != 'DONE':
+            if job_id in listed:
+                unconfirmed[job_id] = unconfirmed.get(job_id, 0) + 1
+            if job_id not in listed or unconfirmed[job_id] >= _BQ_JOB_LIST_POLLS:
+                unconfirmed.pop(job_id, None)
+                job.reload()
+        if job.state == 'DONE':
+            done.append(job_id)
+    return done
+
+
+def bq_run_jobs(job_specs, max_concurrent=10, client=None, poll_interval=1.0, timeout=None, raise_errors=False):
+    """Run bigquery jobs concurrently with bq_jobs_as_completed and wait for all of them. Failures are reported in aggregate.
+
+    Arguments:
+        job_specs {list} -- see bq_jobs_as_completed
+
+    Keyword Arguments:
+        max_concurrent {int} -- maximum number of running jobs (default: {10})
+        client {bigquery.Client} -- client used for polling (default: client instantiated with default credentials)
+        poll_interval {float} -- seconds between polls (default: {1.0})
+        timeout {float} -- seconds (default: {None})
+        raise_errors {bool} -- if True, raises RuntimeError listing all failed jobs after every job completed (default: {False})
+
+    Returns:
+        dict -- jobs {list} in job_specs order, succeeded {int}, failed {int} and errors {list of dict with index, job_id and message}
+
+    """
+    job_specs = list(job_specs)
+    jobs = [None] * len(job_specs)
+    errors = []
+    for index, job, error in bq_jobs_as_completed(job_specs, max_concurrent=max_concurrent, client=client,
+                                                  poll_interval=poll_interval, timeout=timeout):
+        jobs[index] = job
+        if error:
+            errors.append({'index': index, 'job_id': getattr(
+                job, 'job_id', None), 'message': error})
+
+    summary = {'jobs': jobs, 'succeeded': len(
+        jobs) - len(errors), 'failed': len(errors), 'errors': sorted(errors, key=lambda error: error['index'])}
+    logging.info(
+        f"{summary['succeeded']} jobs succeeded and {summary['failed']} jobs failed")
+    if raise_errors and errors:
+        raise RuntimeError(f"{len(errors)} of {len(jobs)} jobs failed: {summary['errors']}")
+    return summary
+
+
+def bq_to_excel(sql, filepath=None, sheet_name=None, index=False, mode='w', client=None, output_option='FILE', engine='openpyxl'):
     """Downloads bigquery query result as excel file from sql statement, script or stored procedure.
 
     Arguments:
@@ -206,9 +1060,14 @@ def bq_to_excel(sql, filepath=None, sheet_name=None, index=False, mode='w', clie
         output_optinos {str} -- {'FILE','IO'}
             FILE write to file on disk
             'IO' returns io.BytesIO
+        engine {str} -- {'openpyxl','stream'} see dfs_to_excel (default: {'openpyxl'})
+            'stream' writes rows to the sheet as result pages are downloaded, with constant memory. Can't be used with mode 'a'
     Returns:
         {str, io.BytesIO} -- filepath of downloaded file or IO
     """
+    if engine == 'stream' and mode == 'a':
+        raise ValueError(
+            "stream engine writes new files only, use engine='openpyxl' to append to existing excel file")
 
     job_id = create_bq_job_id("adhoc_query_to_excel")  # dependency
     if filepath == None:
@@ -220,28 +1079,48 @@ def bq_to_excel(sql, filepath=None, sheet_name=None, index=False, mode='w', clie
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
     job = client.query(sql)
     job.result()
 
     if job.statement_type == 'SCRIPT':
         select_job_ids = bq_get_job_info(
-            job, output_option='LIST')  # dependency
-        dfs = [client.get_job(job_id).to_dataframe()
-               for job_id in select_job_ids]
+            job, client=client, output_option='LIST')  # dependency
+    else:
+        select_job_ids = None
+
+    if engine == 'stream':
+        jobs = [client.get_job(job_id) for job_id in select_job_ids] if select_job_ids is not None else [
+            job]
+        names = _excel_sheet_names(len(jobs), sheet_name)
+
+        def sheets():
+            """Yield sheet of each SELECT job, result pages are downloaded while rows are written."""
+            for name, select_job in zip(names, jobs):
+                rows = select_job.result()
+                yield name, [field.name for field in rows.schema], (row.values() for page in _prefetch_iterator(rows.pages) for row in page)
+
+        _write_excel_stream(filepath, sheets())  # dependency
     else:
-        dfs = [job.to_dataframe()]
+        if select_job_ids is not None:
+            dfs = list(_bq_jobs_to_dfs(
+                select_job_ids, client=client, engine=None).values())
+        else:
+            dfs = [job.to_dataframe()]
 
-    dfs_to_excel(dfs, filepath, sheet_name=sheet_name, mode=mode)  # dependency
+        dfs_to_excel(dfs, filepath, sheet_name=sheet_name,
+                     mode=mode)  # dependency
     if output_option == 'IO':
         filepath.seek(0)
 
     return filepath
 
 
-def bq_to_csv(sql, filepath=None, header=True, client=None, output_option='FILE'):
-    """Download bigquery query result as csv file or io.stringIO.
+def bq_to_csv(sql, filepath=None, header=True, client=None, output_option='FILE', compression=None, max_bytes_per_file=None):
+    """Download bigquery query result as csv file, io.stringIO or generator of bytes.
+
+    Each result page is encoded as it arrives, while next page is downloaded in the background.
 
     Arguments:
         sql {str} -- bigquery SELECT statement in standard SQL
@@ -250,34 +1129,155 @@ def bq_to_csv(sql, filepath=None, header=True, client=None, output_option='FILE'
         filepath {str} -- custom filename for downloaded results (default: yyyymmdd_hhmmss_EST_result.csv)
         header {bool} -- if set to True, keeps headers in the output file (default: {True})
         client {bigquery.Client} -- defaults to client instantiated with default credentials 
-        output_option {str} -- {FILE','IO'} (default: {'FILE'}) 
+        output_option {str} -- {FILE','IO','STREAM'} (default: {'FILE'}) 
             FILE => CSV file in current working directory
-            IO => io.StringIO
+            IO => io.StringIO or io.BytesIO if compression is used
+            STREAM => generator of (compressed) csv bytes, e.g. for streaming http response or upload
+        compression {str} -- {None,'gzip','zstd'} compresses output on the fly, zstd requires zstandard package (default: {None})
+        max_bytes_per_file {int} -- FILE output is split into numbered files e.g. result_000.csv, result_001.csv with header in
+            each file when uncompressed size reaches max_bytes_per_file (default: {None})
 
     Returns:
-        {str} -- filepath of downloaded file
+        {str, list, io.StringIO, io.BytesIO, generator} -- filepath of downloaded file or list of filepaths if max_bytes_per_file is provided
+
+    Example:
+    bq_to_csv(sql, compression='gzip', max_bytes_per_file=500*1000000) # returns list of .csv.gz files
     """
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
     job_id = create_bq_job_id("adhoc_query_to_csv")  # dependency
     if filepath == None:
-        filepath = job_id[:19]+'_result.csv'
+        filepath = job_id[:19]+'_result.csv' + \
+            {'gzip': '.gz', 'zstd': '.zst'}.get(compression, '')
+    compressor = _get_compressor(compression)  # fail before query is run
+
     job = client.query(sql)
-    records = [dict(row) for row in job]
-    df = pd.DataFrame(records)
+    rows = job.result()
 
-    if output_option == 'IO':
-        filepath = io.StringIO()
+    header_lines = _csv_lines(
+        [[field.name for field in rows.schema]]) if header else []
+    pages = _prefetch_iterator(_csv_lines(row.values() for row in page)
+                               for page in rows.pages)  # dependency
 
-    df.to_csv(filepath, header=header, index=False,
-              encoding='utf-8', date_format='iso')
-    if output_option == 'IO':
+    if output_option == 'STREAM':
+        return _csv_bytes(header_lines, pages, compressor)
+
+    elif output_option == 'IO':
+        if compressor:
+            filepath = io.BytesIO()
+            for chunk in _csv_bytes(header_lines, pages, compressor):
+                filepath.write(chunk)
+        else:
+            filepath = io.StringIO()
+            filepath.write(''.join(header_lines))
+            for lines in pages:
+                filepath.write(''.join(lines))
         filepath.seek(0)
+        return filepath
+
+    shards = _write_csv_files(
+        filepath, header_lines, pages, compression, max_bytes_per_file)
+    logging.debug(f"query result written to {shards}")
+    return shards if max_bytes_per_file else shards[0]
+
+
+def _csv_value(value):
+    """Return csv representation of bigquery row value."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    elif isinstance(value, (dict, list)):
+        return _JSON_ENCODER.encode(value)
+    elif isinstance(value, bytes):
+        return base64.b64encode(value).decode('ascii')
+    return value
+
+
+def _csv_lines(rows):
+    """Return list of csv encoded lines, one per row of values."""
+    import csv
+    from types import SimpleNamespace
+
+    lines = []
+    writer = csv.writer(SimpleNamespace(write=lines.append), lineterminator='\n')
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return lines
+
+
+def _get_compressor(compression):
+    """Return streaming compressor object with compress(bytes) and flush() methods or None for no compression."""
+    if not compression:
+        return None
+    elif compression == 'gzip':
+        import zlib
+        return zlib.compressobj(wbits=31)  # gzip container
+    elif compression == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor().compressobj()
+    raise ValueError(
+        f"{compression} compression is not supported, use 'gzip' or 'zstd'")
+
+
+def _csv_bytes(header_lines, pages, compressor=None):
+    """Yield utf-8 encoded and optionally compressed csv bytes, one chunk per page."""
+    for lines in itertools.chain([header_lines], pages):
+        chunk = ''.join(lines).encode('utf-8')
+        if compressor:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+    if compressor:
+        yield compressor.flush()
+
+
+def _write_csv_files(filepath, header_lines, pages, compression=None, max_bytes_per_file=None):
+    """Write csv lines to file, starting a new numbered file with header when max_bytes_per_file uncompressed bytes are reached.
 
-    return filepath
+    Returns:
+        list -- filepaths of written files
+    """
+    stem, extension = re.match(
+        r'(.*?)((?:\.csv)?(?:\.gz|\.zst)?)$', filepath).groups()
+    header = ''.join(header_lines).encode('utf-8')
+    shards = []
+    file = compressor = None
+    size = 0
+
+    def write(data):
+        file.write(compressor.compress(data) if compressor else data)
+
+    def close():
+        if compressor:
+            file.write(compressor.flush())
+        file.close()
+
+    def open_next():
+        nonlocal file, compressor, size
+        if file:
+            close()
+        path = f"{stem}_{len(shards):03d}{extension}" if max_bytes_per_file else filepath
+        shards.append(path)
+        file = open(path, mode='wb')
+        compressor = _get_compressor(compression)
+        write(header)
+        size = len(header)
+
+    open_next()
+    for lines in pages:
+        batch = []
+        for line in lines:
+            line = line.encode('utf-8')
+            if max_bytes_per_file and size + len(line) > max_bytes_per_file and size > len(header):
+                write(b''.join(batch))
+                batch = []
+                open_next()
+            batch.append(line)
+            size += len(line)
+        write(b''.join(batch))
+    close()
+    return shards
 
 
 def bq_get_job_info(job, client=None, output_option=None):
@@ -288,106 +1288,710 @@ def bq_get_job_info(job, client=None, output_option=None):
         For laod jobs: 
             return job_id, job_type, destination_table, write_mode, number of output rows and errors encountered
 
-    Arguments:
-        job {bigquery.job} -- query job or load job
+    Arguments:
+        job {bigquery.job} -- query job or load job
+
+    Keyword Arguments:
+        client {bigquery.Client} -- defaults to client instantiated with default credentials
+        output_option {str} -- {'LIST','DICT'} affects output info for SCRIPT statement query jobs. 
+            'LIST' retruns filtered list of children job_id of SELECT type where result total_row > 1. 
+            'DICT' returns details of children jobs of SELECT type (default: {None})
+
+    Returns:
+        dict | list -- job info is dict, while children job info is list
+
+    Example:
+    bq_get_job_info(client.query(sql_statement)) # returns job_info
+
+    # for SCRIPT, returns detail of children jobs of SELECT statements type
+    bq_get_job_info(script_job, output_option='DICT')
+
+    """
+    if not client:
+        logging.debug(
+            "instantiating bigquery client from defualt environment variable")
+        client = get_client('bigquery')  # dependency
+
+    def extract_table_id(job_destination_path):
+        return f"{job_destination_path.split('/')[2]}.{job_destination_path.split('/')[4]}.{job_destination_path.split('/')[6]}"
+
+    if job.job_type == 'query':
+        if job.statement_type == 'SCRIPT':
+            # child jobs resources are listed in one pass, tables are only fetched for schema or missing row counts
+            child_jobs = list(client.list_jobs(parent_job=job))
+            select_jobs = [
+                child for child in child_jobs if child.statement_type == 'SELECT']
+            total_rows = {child.job_id: _bq_job_total_rows(
+                child) for child in select_jobs}
+
+            if output_option in ('LIST', 'DICT'):
+                lookup_jobs = [
+                    child for child in select_jobs if total_rows[child.job_id] is None]
+            else:
+                lookup_jobs = select_jobs
+            tables = _bq_get_tables(
+                {_bq_table_id(child.destination) for child in lookup_jobs}, client=client)
+            for child in lookup_jobs:
+                if total_rows[child.job_id] is None:
+                    total_rows[child.job_id] = tables[_bq_table_id(
+                        child.destination)].num_rows
+
+            if output_option == 'LIST':
+                data = [child.job_id for child in select_jobs if (
+                    total_rows[child.job_id] or 0) > 1]
+
+            elif output_option == 'DICT':
+                data = [{'job_id': child.job_id, 'statement_type': 'SELECT', 'total_rows': total_rows[child.job_id],
+                         'destination': _bq_table_id(child.destination)} for child in select_jobs]
+            else:
+                children = [{'job_id': child.job_id, 'statement_type': child.statement_type, 'destination': _bq_table_id(child.destination),
+                             'num_dml_affected_rows': child.num_dml_affected_rows} if child.statement_type != 'SELECT' else {'job_id': child.job_id, 'statement_type': child.statement_type,
+                                                                                                                               'total_rows': total_rows[child.job_id], 'destination': _bq_table_id(child.destination), 'schema': [field.to_api_repr() for field in tables[_bq_table_id(child.destination)].schema]} for child in child_jobs]
+                data = {'job_id': job.job_id, 'statement_type': job.statement_type,
+                        'num-child_jobs': job.num_child_jobs, 'child_job': children}
+
+        elif job.statement_type == 'SELECT':
+            data = {'job_id': job.job_id, 'statement_type': job.statement_type,
+                    'total_rows': job.result().total_rows, 'destination': extract_table_id(job.destination.path), 'schema': get_table_schema_from_bq(extract_table_id(job.destination.path), client=client, output_option='DICT')}
+        else:
+            data = {'job_id': job.job_id, 'statement_type': job.statement_type,
+                    'destination': extract_table_id(job.destination.path), 'num_dml_affected_rows': job.num_dml_affected_rows}
+    else:
+        data = {'job_id': job.job_id, 'job_type': job.job_type,
+                'destination': extract_table_id(job.destination.path), 'write_mode': job.write_disposition, 'output_rows': job.output_rows, 'errors': job.errors}
+    return data
+
+
+def _bq_table_id(table_reference):
+    """Return fully qualified table_id from bigquery.table.TableReference or None."""
+    if table_reference:
+        return f"{table_reference.project}.{table_reference.dataset_id}.{table_reference.table_id}"
+
+
+def _bq_job_total_rows(job):
+    """Return number of rows written by the output stage of completed query job from job statistics, None if query plan is not available e.g. cached result."""
+    query_plan = job.query_plan
+    if query_plan:
+        return query_plan[-1].records_written
+
+
+def _bq_get_tables(table_ids, client, max_workers=8):
+    """Fetch tables concurrently on a thread pool, each distinct table_id is fetched once.
+
+    Arguments:
+        table_ids {iterable} -- fully qualified table ids
+        client {bigquery.Client}
+
+    Keyword Arguments:
+        max_workers {int} -- maximum number of concurrent requests (default: {8})
+
+    Returns:
+        dict -- table_id: bigquery.Table
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    table_ids = list(dict.fromkeys(table_id for table_id in table_ids if table_id))
+    if not table_ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(table_ids))) as executor:
+        tables = list(executor.map(
+            lambda table_id: _bq_get_table(table_id, client), table_ids))
+    return dict(zip(table_ids, tables))
+
+
+_BQ_TABLE_CACHE = {}  # table_id: (fetched monotonic time, bigquery.Table)
+_BQ_TABLE_CACHE_TTL = 300
+_BQ_TABLE_PENDING_JOBS = {}  # table_id: list of (submitted monotonic time, job modifying the table)
+
+
+def _bq_table_cache_key(table_id, client=None):
+    """Return project.dataset.table key for table id string, bigquery.Table or bigquery.TableReference."""
+    if hasattr(table_id, 'dataset_id'):
+        return _bq_table_id(table_id)
+    key = str(table_id).replace(':', '.')
+    if client and key.count('.') == 1:
+        key = f"{client.project}.{key}"
+    return key
+
+
+def _bq_get_table(table_id, client, max_age=None):
+    """Return bigquery.Table from in-process metadata cache, fetched with client.get_table if missing or older than max_age.
+
+    Cached tables are shared between callers and must not be modified, use client.get_table for read-modify-write.
+
+    Arguments:
+        table_id {str} -- fully qualified table id
+        client {bigquery.Client}
+
+    Keyword Arguments:
+        max_age {float} -- seconds, defaults to env variable ``BQ_TABLE_CACHE_TTL`` or 300. 0 always fetches (default: {None})
+
+    Returns:
+        bigquery.Table
+    """
+    import time
+
+    if max_age is None:
+        max_age = float(os.environ.get(
+            'BQ_TABLE_CACHE_TTL', _BQ_TABLE_CACHE_TTL))
+    key = _bq_table_cache_key(table_id, client)
+    pending = _BQ_TABLE_PENDING_JOBS.get(key)
+    if pending:
+        # local job state only, updated by result(), reload() or bq_jobs_as_completed, no request is made
+        running = [(submitted, job) for submitted, job in pending
+                   if getattr(job, 'state', 'DONE') != 'DONE' and time.monotonic() - submitted < max_age]
+        if running:
+            _BQ_TABLE_PENDING_JOBS[key] = running
+            logging.debug(f"{key} is modified by running job, bypassing metadata cache")
+            return client.get_table(table_id)
+        _BQ_TABLE_PENDING_JOBS.pop(key, None)
+        _BQ_TABLE_CACHE.pop(key, None)
+
+    cached = _BQ_TABLE_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < max_age:
+        return cached[1]
+
+    table = client.get_table(table_id)
+    _BQ_TABLE_CACHE[key] = (time.monotonic(), table)
+    return table
+
+
+def bq_table_cache_clear(table_id=None, client=None):
+    """Invalidate cached table metadata used by get_table_schema_from_bq, bq_list_tables, bq_export_csv_to_gcs and bq_get_job_info.
+
+    Tables are invalidated automatically when modified with df_to_bq, df_to_bq_with_json_objects, bq_load_gcs_csv,
+    bq_result_to_table, bq_copy_table, bq_create_table and bq_del_table. Cached metadata expires after
+    ``BQ_TABLE_CACHE_TTL`` env variable seconds (default 300).
+
+    Keyword Arguments:
+        table_id {str} -- fully qualified table id, if None whole cache is cleared (default: {None})
+        client {bigquery.Client} -- used to qualify table_id without project (default: {None})
+    """
+    if table_id is None:
+        _BQ_TABLE_CACHE.clear()
+    else:
+        _BQ_TABLE_CACHE.pop(_bq_table_cache_key(table_id, client), None)
+
+
+def _bq_table_cache_track(job, table_id, client=None):
+    """Invalidate cached metadata of table_id and bypass the cache while job modifying it is not done.
+
+    Completion is checked lazily from local job state on next cache read, no polling thread is started for the job.
+    """
+    import time
+
+    bq_table_cache_clear(table_id, client=client)
+    if hasattr(job, 'state'):
+        key = _bq_table_cache_key(table_id, client)
+        _BQ_TABLE_PENDING_JOBS[key] = _BQ_TABLE_PENDING_JOBS.get(
+            key, []) + [(time.monotonic(), job)]
+    return job
+
+
+def df_to_bq(df, table_id, client=None, write_mode='WRITE_APPEND', schema=None, autodetect=True, job_id=None, format=None, compression=None, chunk_rows=None, max_workers=4, staging_bucket=None, storage_client=None, raise_errors=True, **job_config):
+    """Write DataFrame to bigquery table with custom schema.
+
+    Arguments:
+        df {pd.DataFrame} -- pandas dataframe as source
+        table_id {str} -- fully qualified table_id as write destination e.g. project_id.dataset.table_name
+
+    Keyword Arguments:
+        client {bigquery.Client} -- defaults to client instantiated with default credentials
+        write_mode {str} -- {'WRITE_APPEND' , 'WRITE_TRUNCATE' , 'WRITE_EMPTY'}. (default: {'WRITE_APPEND'})
+        schema {list} -- list of bigquery.schema.SchemaField 
+            Partial schema is acceptable. 
+            Use get_table_schema_from_bq(table_id) or get_table_schema_from_df(df) to enforce existing table schema
+        autodetect {bool} -- if True, bigquery infers datatype, (default: {'True'})
+        job_id {str} -- optional argument, use function create_bq_job_id(description=None) to create custom job id
+        format {str} -- {'PARQUET','AVRO','CSV','NEWLINE_DELIMITED_JSON','AUTO'} serialization format of the upload.
+            if None, client library's default serializer is used. 'AUTO' picks PARQUET for flat and nested frames and
+            NEWLINE_DELIMITED_JSON if an object column mixes types which can't be written to parquet.
+            PARQUET writes dict and list of dict columns as struct and list<struct> columns.
+            AVRO requires fastavro package. Use df_serialization_benchmark(df) to compare formats (default: {None})
+        compression {str} -- codec of the serialized file e.g. 'snappy', 'gzip', 'zstd' or None for PARQUET, 'deflate' or 'snappy' for AVRO
+            and 'gzip' for CSV and NEWLINE_DELIMITED_JSON (default: {None} i.e. snappy for PARQUET and uncompressed otherwise)
+        chunk_rows {int} -- if df has more rows, it is split into chunks of chunk_rows which are serialized and uploaded concurrently.
+            The function waits for the load to complete and returns aggregated job info (default: {None})
+        max_workers {int} -- number of chunks serialized and uploaded at the same time (default: {4})
+        staging_bucket {str} -- google cloud storage bucket for chunked load. Chunks are staged as parquet files and loaded with single
+            wildcard load job, staged files are deleted afterwards. If not provided, each chunk is loaded with its own load job, which is
+            not atomic: failed chunks don't roll back loaded ones and, with WRITE_TRUNCATE, a failed chunk leaves the table truncated with
+            partial data (default: {None})
+        storage_client {google.storage.Client} -- storage client for staging_bucket (default: {None})
+        raise_errors {bool} -- if True, chunked load raises RuntimeError listing failed chunks after all chunks completed, like result()
+            of a single load job. If False, failed chunks are only listed in ``errors`` of returned job info (default: {True})
+        job_config {dict} -- any other keyowrd argument for bigquery.job.LoadJobConfig
+
+    Returns:
+        {biqquery.LoadJob, dict} -- load job or, if df was loaded in chunks, dict with job_ids, job_type, destination, write_mode, output_rows and errors
+
+    Example:
+    job_info = df_to_bq(df, table_id, chunk_rows=1000000, max_workers=8, staging_bucket='my-staging-bucket')
+        """
+    if not client:
+        logging.debug(
+            "instantiating bigquery client from defualt environment variable")
+        client = get_client('bigquery')  # dependency
+
+    job_config = bigquery.LoadJobConfig(**job_config)
+    job_config.autodetect = autodetect
+    job_config.write_disposition = write_mode
+
+    if schema:
+        job_config.schema = schema
+
+    if format and format.upper() == 'AUTO':
+        format = _df_auto_format(df)
+        logging.debug(f"{format} format selected for {table_id}")
+
+    if chunk_rows and len(df) > chunk_rows:
+        chunks = [df.iloc[start:start + chunk_rows]
+                  for start in range(0, len(df), chunk_rows)]
+        try:
+            if staging_bucket:
+                summary = _df_to_bq_staged(chunks, table_id, client, job_config, job_id=job_id, max_workers=max_workers,
+                                           staging_bucket=staging_bucket, storage_client=storage_client, format=format or 'PARQUET', compression=compression)
+            else:
+                summary = _df_to_bq_chunked(chunks, table_id, client, job_config, job_id=job_id,
+                                            max_workers=max_workers, format=format, compression=compression)
+            if raise_errors and summary['errors']:
+                raise RuntimeError(
+                    f"{len(summary['errors'])} chunk loads to {table_id} failed: {summary['errors']}")
+            return summary
+        finally:
+            bq_table_cache_clear(table_id, client=client)
+
+    load_job = _load_df(client, df, table_id, job_config,
+                        job_id=job_id, format=format, compression=compression)
+    return _bq_table_cache_track(load_job, table_id, client)
+
+
+def _load_df(client, df, table_id, job_config, job_id=None, format=None, compression=None):
+    """Start load job for DataFrame serialized in format, or with client library's default serializer if format is None."""
+    if not format:
+        return client.load_table_from_dataframe(
+            df, table_id, job_id=job_id, job_config=job_config)
+
+    encoder, source_format, _ = _df_encoder(format)
+    job_config = _copy_job_config(job_config)
+    _set_source_format(job_config, source_format)
+
+    return client.load_table_from_file(
+        encoder(df, compression=compression), table_id, job_id=job_id, job_config=job_config)
+
+
+def _set_source_format(job_config, source_format):
+    """Set source format of load job config with options needed to load files of _df_encoder."""
+    job_config.source_format = source_format
+    if source_format == bigquery.SourceFormat.CSV:
+        job_config.skip_leading_rows = 1
+    elif source_format == bigquery.SourceFormat.AVRO:
+        job_config.use_avro_logical_types = True
+    elif source_format == bigquery.SourceFormat.PARQUET:
+        # load parquet LIST columns as REPEATED fields instead of RECORD with list.element
+        if hasattr(bigquery, 'ParquetOptions'):
+            parquet_options = bigquery.ParquetOptions()
+            parquet_options.enable_list_inference = True
+            job_config.parquet_options = parquet_options
+        else:
+            job_config._properties['load']['parquetOptions'] = {
+                'enableListInference': True}
+
+
+def _copy_job_config(job_config):
+    """Return independent copy of bigquery job config."""
+    return type(job_config).from_api_repr(job_config.to_api_repr())
+
+
+def _load_job_summary(jobs, table_id, write_mode, errors):
+    """Return aggregated job info of load jobs in bq_get_job_info format, None jobs of chunks which failed to upload are skipped."""
+    jobs = [job for job in jobs if job is not None]
+    return {'job_ids': [job.job_id for job in jobs], 'job_type': 'load', 'destination': table_id, 'write_mode': write_mode,
+            'output_rows': sum(job.output_rows or 0 for job in jobs), 'errors': errors}
+
+
+def _df_to_bq_chunked(chunks, table_id, client, job_config, job_id=None, max_workers=4, format=None, compression=None):
+    """Load DataFrame chunks with one load job per chunk, running up to max_workers jobs concurrently.
+
+    Chunks are serialized by the client library in worker threads, pyarrow releases the GIL so serialization uses several cores.
+    For WRITE_TRUNCATE and WRITE_EMPTY, first chunk is loaded before the others are appended. Loads are not atomic, failed chunks are
+    reported in errors of returned job info while loaded chunks stay in the table.
+
+    Returns:
+        dict -- aggregated job info, see _load_job_summary
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    write_mode = job_config.write_disposition
+    append_config = _copy_job_config(job_config)
+    append_config.write_disposition = 'WRITE_APPEND'
+    jobs = []
+    errors = []
+
+    def load(n, chunk, config):
+        chunk_job_id = f"{job_id}_{n:05d}" if job_id else None
+        job = None
+        try:
+            job = _load_df(client, chunk, table_id, config,
+                           job_id=chunk_job_id, format=format, compression=compression)
+            job.result()
+        except Exception as error:
+            logging.error(
+                f"chunk {n} load job {job.job_id if job else chunk_job_id} failed: {error}")
+            errors.append({'chunk': n, 'job_id': job.job_id if job else chunk_job_id,
+                           'message': str(error)})
+        return job
+
+    first = 0
+    if write_mode in ('WRITE_TRUNCATE', 'WRITE_EMPTY'):
+        jobs.append(load(0, chunks[0], job_config))
+        first = 1
+        if errors:
+            return _load_job_summary(jobs, table_id, write_mode, errors)
+    else:
+        append_config = job_config
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        jobs += list(executor.map(load, range(first, len(chunks)),
+                                  chunks[first:], [append_config] * (len(chunks) - first)))
+
+    summary = _load_job_summary(jobs, table_id, write_mode, errors)
+    logging.info(
+        f"{summary['output_rows']} rows loaded to {table_id} with {len(jobs)} load jobs")
+    return summary
+
+
+def _df_to_bq_staged(chunks, table_id, client, job_config, job_id=None, max_workers=4, staging_bucket=None, storage_client=None, format='PARQUET', compression=None):
+    """Serialize DataFrame chunks, upload them to staging bucket concurrently and load all with single wildcard load job.
+
+    Staged files are deleted after the load job completes or fails.
+
+    Returns:
+        dict -- aggregated job info, see _load_job_summary
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not storage_client:
+        logging.debug(
+            "instantiating storage client from defualt environment variable")
+        storage_client = get_client('storage')  # dependency
+
+    bucket = storage_client.bucket(staging_bucket)
+    prefix = f"bigquery_staging/{job_id or create_bq_job_id('df_to_bq staging')}"  # dependency
+
+    encoder, source_format, extension = _df_encoder(format)
+
+    def stage(n, chunk):
+        blob = bucket.blob(f"{prefix}/chunk_{n:05d}{extension}")
+        blob.upload_from_file(encoder(chunk, compression=compression))
+
+    job_config = _copy_job_config(job_config)
+    _set_source_format(job_config, source_format)
+    errors = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            list(executor.map(stage, range(len(chunks)), chunks))
+        logging.debug(
+            f"{len(chunks)} chunks staged in gs://{staging_bucket}/{prefix}")
+
+        job = client.load_table_from_uri(
+            f"gs://{staging_bucket}/{prefix}/chunk_*{extension}", table_id, job_id=job_id, job_config=job_config)
+        try:
+            job.result()
+        except Exception as error:
+            logging.error(f"load job {job.job_id} failed: {error}")
+            errors.append({'job_id': job.job_id, 'message': str(error)})
+    finally:
+        bucket.delete_blobs(list(bucket.list_blobs(prefix=f"{prefix}/")))
+
+    summary = _load_job_summary([job], table_id, job_config.write_disposition, errors)
+    logging.info(
+        f"{summary['output_rows']} rows loaded to {table_id} from {len(chunks)} staged files")
+    return summary
+
+
+def _df_to_parquet(df, compression=None, schema=None):
+    """Serialize DataFrame to parquet file in memory, compression defaults to snappy.
+
+    Columns of dict and list of dict objects are written as arrow struct and list<struct> columns with schema of
+    get_table_schema_from_df(df, sample_size=1000), fields of schema {list of bigquery.schema.SchemaField} take precedence over inferred ones.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_schema = None
+    if schema or _df_has_nested_columns(df):
+        df = df.copy(deep=False)  # get_table_schema_from_df renames invalid columns
+        fields = {field.name: field for field in get_table_schema_from_df(
+            df, sample_size=1000)}  # dependency
+        fields.update({field.name: field for field in schema or []
+                       if field.name in fields})
+        arrow_schema = _bq_schema_to_arrow(list(fields.values()), df)
+
+    buffer = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, schema=arrow_schema, preserve_index=False),
+                   buffer, compression=compression or 'snappy')
+    buffer.seek(0)
+    return buffer
+
+
+def _df_to_avro(df, compression=None):
+    """Serialize DataFrame with flat columns to avro file in memory with fastavro, compression is 'null', 'deflate' or 'snappy'."""
+    import fastavro
+
+    avro_types = {'INTEGER': 'long', 'FLOAT': 'double', 'BOOLEAN': 'boolean', 'STRING': 'string',
+                  'TIMESTAMP': {'type': 'long', 'logicalType': 'timestamp-micros'},
+                  'DATETIME': {'type': 'string', 'logicalType': 'datetime'},
+                  'DATE': {'type': 'int', 'logicalType': 'date'}}
+    fields = []
+    datetime_columns = {}
+    for column in df.columns:
+        field = _create_field_schema_api_repr(df[column])
+        if field['type'] not in avro_types or field['mode'] == 'REPEATED':
+            raise ValueError(
+                f"{column} of type {field['mode']} {field['type']} is not supported by AVRO serializer, use NEWLINE_DELIMITED_JSON")
+        if field['type'] == 'DATETIME' or pd.api.types.is_datetime64_dtype(df[column].dtype):
+            # naive datetimes are DATETIME, timestamp-micros would be loaded as TIMESTAMP
+            field['type'] = 'DATETIME'
+            datetime_columns[column] = _datetime_as_string(df[column], unit='us')
+        fields.append({'name': str(column), 'type': [
+                      'null', avro_types[field['type']]]})
+    avro_schema = fastavro.parse_schema(
+        {'type': 'record', 'name': 'Root', 'fields': fields})
+
+    df = _df_replace_columns(df, datetime_columns)
+    records = df.astype(object).where(df.notna(), None).to_dict('records')
+    buffer = io.BytesIO()
+    fastavro.writer(buffer, avro_schema, records,
+                    codec=compression or 'null')
+    buffer.seek(0)
+    return buffer
+
+
+def _df_to_csv(df, compression=None):
+    """Serialize DataFrame to csv file with header in memory, compression is None or 'gzip'."""
+    text = _df_datetimes_as_strings(df).to_csv(index=False)
+    return _encode_text(text, compression)
+
+
+def _df_to_ndjson(df, compression=None):
+    """Serialize DataFrame to newline delimited json file in memory, compression is None or 'gzip'."""
+    text = _df_datetimes_as_strings(df).to_json(
+        orient='records', lines=True, date_format='iso', date_unit='us')
+    return _encode_text(text, compression)
+
+
+def _encode_text(text, compression=None):
+    """Return utf-8 encoded text as io.BytesIO, gzip compressed if compression is 'gzip'."""
+    import gzip
+
+    data = text.encode('utf-8')
+    if compression == 'gzip':
+        data = gzip.compress(data)
+    elif compression:
+        raise ValueError(
+            f"{compression} compression is not supported for text formats, use None or 'gzip'")
+    return io.BytesIO(data)
+
+
+def _df_datetimes_as_strings(df):
+    """Return DataFrame with datetime columns as bigquery literal strings, df passed in is not modified.
+
+    Timezone aware columns are converted to UTC and suffixed with +00:00 (TIMESTAMP), naive datetime64 columns keep wall clock time
+    (DATETIME) and columns of datetime.date objects are written as YYYY-MM-DD (DATE). Microseconds are kept.
+    """
+    columns = {}
+    for column, dtype in df.dtypes.items():
+        series = df[column]
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            strings = _datetime_as_string(series, unit='us')
+            if getattr(dtype, 'tz', None) is not None:
+                strings = strings.where(strings.isna(), strings + '+00:00')
+            columns[column] = strings
+        elif dtype == object:
+            valid = series.dropna()
+            first = valid.iloc[0] if len(valid) else None
+            if isinstance(first, datetime.datetime):
+                aware = first.tzinfo is not None
+                strings = _datetime_as_string(
+                    pd.to_datetime(series, utc=aware), unit='us')
+                columns[column] = strings.where(strings.isna(), strings + '+00:00') if aware else strings
+            elif isinstance(first, datetime.date):
+                columns[column] = _datetime_as_string(series, unit='D')
+    return _df_replace_columns(df, columns)
+
+
+def _df_replace_columns(df, columns):
+    """Return shallow copy of DataFrame with columns {dict} of column: series replaced, df passed in is not modified."""
+    if not columns:
+        return df
+    df = df.copy(deep=False)
+    for column, series in columns.items():
+        df[column] = series
+    return df
+
+
+_DF_ENCODERS = {
+    'PARQUET': (_df_to_parquet, bigquery.SourceFormat.PARQUET, '.parquet'),
+    'AVRO': (_df_to_avro, bigquery.SourceFormat.AVRO, '.avro'),
+    'CSV': (_df_to_csv, bigquery.SourceFormat.CSV, '.csv'),
+    'NEWLINE_DELIMITED_JSON': (_df_to_ndjson, bigquery.SourceFormat.NEWLINE_DELIMITED_JSON, '.json'),
+}
+
+
+def _df_encoder(format):
+    """Return (encoder function, bigquery.SourceFormat, file extension) for serialization format."""
+    format = format.upper()
+    format = 'NEWLINE_DELIMITED_JSON' if format in ('NDJSON', 'JSON') else format
+    if format not in _DF_ENCODERS:
+        raise ValueError(
+            f"{format} is not supported, use one of {list(_DF_ENCODERS)} or 'AUTO'")
+    return _DF_ENCODERS[format]
 
-    Keyword Arguments:
-        client {bigquery.Client} -- defaults to client instantiated with default credentials
-        output_option {str} -- {'LIST','DICT'} affects output info for SCRIPT statement query jobs. 
-            'LIST' retruns filtered list of children job_id of SELECT type where result total_row > 1. 
-            'DICT' returns details of children jobs of SELECT type (default: {None})
 
-    Returns:
-        dict | list -- job info is dict, while children job info is list
+def _df_has_nested_columns(df):
+    """Return True if any object column of DataFrame holds dict or list values."""
+    for column in df.columns[df.dtypes == object]:
+        sample = df[column].dropna()
+        if len(sample) and isinstance(sample.iloc[0], (dict, list)):
+            return True
+    return False
 
-    Example:
-    bq_get_job_info(client.query(sql_statement)) # returns job_info
 
-    # for SCRIPT, returns detail of children jobs of SELECT statements type
-    bq_get_job_info(script_job, output_option='DICT')
+def _df_auto_format(df):
+    """Return serialization format for DataFrame from its column types.
 
+    PARQUET for flat and nested frames, since _df_to_parquet writes dict and list columns as structs, NEWLINE_DELIMITED_JSON if an object
+    column holds values pyarrow can't convert to one arrow type e.g. mixed strings and numbers.
     """
-    if not client:
-        logging.debug(
-            "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+    import pyarrow as pa
 
-    def extract_table_id(job_destination_path):
-        return f"{job_destination_path.split('/')[2]}.{job_destination_path.split('/')[4]}.{job_destination_path.split('/')[6]}"
-
-    if job.job_type == 'query':
-        if job.statement_type == 'SCRIPT':
-            child_jobs_iterable = client.list_jobs(parent_job=job)
-            children = [{'job_id': job.job_id, 'statement_type': job.statement_type, 'destination': extract_table_id(job.destination.path),
-                         'num_dml_affected_rows': job.num_dml_affected_rows} if job.statement_type != 'SELECT' else {'job_id': job.job_id, 'statement_type': job.statement_type,
-                                                                                                                     'total_rows': job.result().total_rows, 'destination': extract_table_id(job.destination.path), 'schema': get_table_schema_from_bq(extract_table_id(job.destination.path), client=client, output_option='DICT')} for job in child_jobs_iterable]
-            data = {'job_id': job.job_id, 'statement_type': job.statement_type,
-                    'num-child_jobs': job.num_child_jobs, 'child_job': children}
+    for column in df.columns[df.dtypes == object]:
+        try:
+            pa.array(df[column], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError) as error:
+            logging.debug(
+                f"{column} can't be converted to arrow, using NEWLINE_DELIMITED_JSON: {error}")
+            return 'NEWLINE_DELIMITED_JSON'
+    return 'PARQUET'
 
-            if output_option == 'LIST':
-                children_job_id_SELECT = [job.get('job_id') for job in data.get(
-                    'child_job') if job.get('statement_type') == 'SELECT' and job.get('total_rows') > 1]
-                data = children_job_id_SELECT
 
-            elif output_option == 'DICT':
-                children_job_id_SELECT = [job.get('job_id') for job in data.get(
-                    'child_job') if job.get('statement_type') == 'SELECT']
-                data = [{'job_id': child, 'statement_type': 'SELECT', 'total_rows': client.get_job(child).result(
-                ).total_rows, 'destination': extract_table_id(client.get_job(child).destination.path)} for child in children_job_id_SELECT]
+def _bq_schema_to_arrow(schema, df=None):
+    """Convert list of bigquery.schema.SchemaField to pyarrow.Schema, RECORD fields become struct and REPEATED fields list.
 
-        elif job.statement_type == 'SELECT':
-            data = {'job_id': job.job_id, 'statement_type': job.statement_type,
-                    'total_rows': job.result().total_rows, 'destination': extract_table_id(job.destination.path), 'schema': get_table_schema_from_bq(extract_table_id(job.destination.path), client=client, output_option='DICT')}
+    Fields without type e.g. Int64, category or uint columns, or with types without arrow mapping e.g. BIGNUMERIC, GEOGRAPHY or JSON
+    take the type pyarrow infers from the column of df {pandas.DataFrame}.
+    """
+    import pyarrow as pa
+
+    arrow_types = {'STRING': pa.string(), 'INTEGER': pa.int64(), 'INT64': pa.int64(), 'FLOAT': pa.float64(),
+                   'FLOAT64': pa.float64(), 'BOOLEAN': pa.bool_(), 'BOOL': pa.bool_(), 'BYTES': pa.binary(),
+                   'TIMESTAMP': pa.timestamp('us', tz='UTC'), 'DATETIME': pa.timestamp('us'), 'DATE': pa.date32(),
+                   'TIME': pa.time64('us'), 'NUMERIC': pa.decimal128(38, 9)}
+
+    def arrow_type(field):
+        """Return arrow type of field or None if field or one of its children has no arrow mapping."""
+        bq_type = (field._properties.get('type') or '').upper()  # field_type raises for fields without type
+        if bq_type in ('RECORD', 'STRUCT'):
+            children = [arrow_type(child) for child in field.fields]
+            if None in children:
+                return None
+            field_type = pa.struct([pa.field(child.name, child_type)
+                                    for child, child_type in zip(field.fields, children)])
         else:
-            data = {'job_id': job.job_id, 'statement_type': job.statement_type,
-                    'destination': extract_table_id(job.destination.path), 'num_dml_affected_rows': job.num_dml_affected_rows}
-    else:
-        data = {'job_id': job.job_id, 'job_type': job.job_type,
-                'destination': extract_table_id(job.destination.path), 'write_mode': job.write_disposition, 'output_rows': job.output_rows, 'errors': job.errors}
-    return data
+            field_type = arrow_types.get(bq_type)
+        if field_type is not None and field.mode == 'REPEATED':
+            field_type = pa.list_(field_type)
+        return field_type
 
+    arrow_fields = []
+    for field in schema:
+        field_type = arrow_type(field)
+        if field_type is None:
+            if df is None or field.name not in df.columns:
+                raise ValueError(
+                    f"{field.name} of type {field._properties.get('type')} can't be converted to arrow type")
+            field_type = pa.array(df[field.name], from_pandas=True).type
+        arrow_fields.append(pa.field(field.name, field_type))
+    return pa.schema(arrow_fields)
 
-def df_to_bq(df, table_id, client=None, write_mode='WRITE_APPEND', schema=None, autodetect=True, job_id=None, **job_config):
-    """Write DataFrame to bigquery table with custom schema.
 
-    Arguments:
-        df {pd.DataFrame} -- pandas dataframe as source
-        table_id {str} -- fully qualified table_id as write destination e.g. project_id.dataset.table_name
+def df_serialization_benchmark(df=None, formats=None, num_rows=100000, num_columns=20, repeat=3):
+    """Benchmark serialization formats of df_to_bq without uploading. Returns encode time and payload size per format.
+
+    Without df, three synthetic frames are benchmarked: ``numeric`` (float and integer columns), ``mixed`` (string, timestamp, date,
+    bool and float columns) and ``nested`` (dict and list of dict columns).
 
     Keyword Arguments:
-        client {bigquery.Client} -- defaults to client instantiated with default credentials
-        write_mode {str} -- {'WRITE_APPEND' , 'WRITE_TRUNCATE' , 'WRITE_EMPTY'}. (default: {'WRITE_APPEND'})
-        schema {list} -- list of bigquery.schema.SchemaField 
-            Partial schema is acceptable. 
-            Use get_table_schema_from_bq(table_id) or get_table_schema_from_df(df) to enforce existing table schema
-        autodetect {bool} -- if True, bigquery infers datatype, (default: {'True'})
-        job_id {str} -- optional argument, use function create_bq_job_id(description=None) to create custom job id
-        job_config {dict} -- any other keyowrd argument for bigquery.job.LoadJobConfig
+        df {pandas.DataFrame} -- frame to benchmark (default: {None} i.e. synthetic frames)
+        formats {list} -- list of (format, compression) tuples (default: all formats with default and gzip/zstd compression)
+        num_rows {int} -- rows of synthetic frames (default: {100000})
+        num_columns {int} -- columns of synthetic frames (default: {20})
+        repeat {int} -- best of repeat runs is reported (default: {3})
 
     Returns:
-        biqquery.LoadJob
+        pandas.DataFrame -- frame, format, compression, encode_seconds, size_MB, rows_per_second and auto_format columns,
+            formats which can't encode the frame (e.g. AVRO for nested columns or missing fastavro) report error
 
-        """
-    if not client:
-        logging.debug(
-            "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
-
-    job_config = bigquery.LoadJobConfig(**job_config)
-    job_config.autodetect = autodetect
-    job_config.write_disposition = write_mode
-
-    if schema:
-        job_config.schema = schema
-
-    load_job = client.load_table_from_dataframe(
-        df, table_id, job_id=job_id, job_config=job_config)
-    return load_job
+    Example:
+    df_serialization_benchmark() # synthetic frames
+    df_serialization_benchmark(df, formats=[('PARQUET', 'snappy'), ('PARQUET', 'zstd'), ('CSV', None)])
+    """
+    import time
+    import numpy as np
 
+    if not formats:
+        formats = [('PARQUET', None), ('PARQUET', 'gzip'), ('PARQUET', 'zstd'), ('AVRO', None), ('AVRO', 'deflate'),
+                   ('CSV', None), ('CSV', 'gzip'), ('NEWLINE_DELIMITED_JSON', None), ('NEWLINE_DELIMITED_JSON', 'gzip')]
 
-def df_to_bq_with_json_objects(df, table_id, client=None, schema=None, json_str_column=None, write_mode='WRITE_APPEND', job_id=None, **job_config):
+    if df is not None:
+        frames = {'df': df}
+    else:
+        rng = np.random.default_rng(0)
+        numeric = pd.DataFrame({f"col_{i}": rng.random(num_rows) if i % 2 else rng.integers(0, 1000000, num_rows)
+                                for i in range(num_columns)})
+        mixed = pd.DataFrame({f"col_{i}": [rng.random(num_rows),
+                                           pd.Series(rng.integers(0, 1000, num_rows)).map(
+                                               'category_{}'.format),
+                                           pd.Timestamp('2020-01-01') + pd.to_timedelta(
+                                               rng.integers(0, 10**9, num_rows), unit='s'),
+                                           pd.Series(pd.Timestamp('2020-01-01') + pd.to_timedelta(
+                                               rng.integers(0, 3650, num_rows), unit='D')).dt.date,
+                                           rng.random(num_rows) > 0.5][i % 5] for i in range(num_columns)})
+        nested = pd.DataFrame({'id': np.arange(num_rows),
+                               'attributes': [{'name': f"name_{i % 100}", 'score': float(i)} for i in range(num_rows)],
+                               'events': [[{'type': 'click', 'count': i % 7}] * (i % 3) for i in range(num_rows)]})
+        frames = {'numeric': numeric, 'mixed': mixed, 'nested': nested}
+
+    results = []
+    for name, frame in frames.items():
+        auto_format = _df_auto_format(frame)
+        for format, compression in formats:
+            encoder = _df_encoder(format)[0]
+            result = {'frame': name, 'format': format, 'compression': compression or 'default',
+                      'auto_format': auto_format == format}
+            try:
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    payload = encoder(frame, compression=compression)
+                    timings.append(time.perf_counter() - start)
+                result['encode_seconds'] = min(timings)
+                result['size_MB'] = payload.getbuffer().nbytes/1000000
+                result['rows_per_second'] = len(frame)/result['encode_seconds']
+            except Exception as error:
+                result['error'] = str(error)
+            results.append(result)
+    return pd.DataFrame(results)
+
+
+def df_to_bq_with_json_objects(df, table_id, client=None, schema=None, json_str_column=None, write_mode='WRITE_APPEND', job_id=None, chunk_rows=50000, format='NEWLINE_DELIMITED_JSON', **job_config):
     """Write DataFrame to bigquery with nested and repeated fields or JSON objects.
 
+    DataFrame is encoded to newline delimited json chunk by chunk while the upload is in progress, df passed in is not modified.
+    With format='PARQUET', dict and list of dict columns are converted to arrow struct and list<struct> columns with
+    schema of get_table_schema_from_df(df) and loaded as parquet file, which is smaller and faster to load than json.
+
     Arguments:
         df {pd.DataFrame} -- pandas dataframe to be updoad
         table_id {str} -- fully qualified bq table id as write destination e.g. project_id.dataset.new_tablename
@@ -398,7 +2002,11 @@ def df_to_bq_with_json_objects(df, table_id, client=None, schema=None, json_str_
         schema {list} -- list of bigquery.schema.SchemaField 
             Partial schema is acceptable. 
             Use get_table_schema_from_bq(table_id) or get_table_schema_from_df(df) to enforce existing table schema
+        json_str_column {str,list} -- column or list of columns with objects to be loaded as json strings
         job_id {str} -- optional argument, use function create_bq_job_id(description=None) to create custom job id for logging
+        chunk_rows {int} -- number of rows encoded at a time (default: {50000})
+        format {str} -- {'NEWLINE_DELIMITED_JSON','PARQUET'} (default: {'NEWLINE_DELIMITED_JSON'})
+            for 'PARQUET', schema fields take precedence over inferred ones and json_str_column is casted to json strings
         job_config {dict} -- any other keyowrd argument for bigquery.job.LoadJobConfig
 
     Returns:
@@ -412,75 +2020,127 @@ def df_to_bq_with_json_objects(df, table_id, client=None, schema=None, json_str_
     job = df_to_bq_with_json_objects(df,table_id,schema=schema,client=client,**job_config)
     job.result()
 
-    """
-    from io import StringIO
-
-    def get_datetime_columns(schema):
-        """Return list TIMESTAMP columns from list of bigquery.schema.SchemaField
-        """
-        return [field.name for field in schema if field.field_type in ['TIMESTAMP']]
-
-    def get_date_columns(schema):
-        """Return list of DATE columns from list of bigquery.schema.SchemaField
-        """
-        return [field.name for field in schema if field.field_type in ['DATE']]
+    # nested and repeated fields as parquet
+    job = df_to_bq_with_json_objects(df,table_id,format='PARQUET')
 
+    """
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
-
-    if schema:
-        datetime_columns = get_datetime_columns(schema)
-        date_columns = get_date_columns(schema)
-    else:
-        datetime_columns = None
-        date_columns = None
-
-    if datetime_columns:
-        #         logging.debug(f"{datetime_columns} will be casted to %Y-%m-%d %H:%M:%S.%f string")
-        for column in datetime_columns:
-            # df[column].apply(lambda x: x.isoformat())
-            df[column] = df[column].dt.strftime('%Y-%m-%d %H:%M:%S.%f')
-
-    if date_columns:
-        #         logging.debug(f"{date_columns} will be casted to %Y-%m-%d string")
-        for column in date_columns:
-            # datetime.date object is problematic
-            df[column] = pd.to_datetime(df[column])
-            # df[column].apply(lambda x: x.isoformat())
-            df[column] = df[column].dt.strftime('%Y-%m-%d')
-
-    if json_str_column:
-        if isinstance(json_str_column, list):
-            for column in json_str_column:
-                df[column] = df[column].apply(json.dumps)
-        else:
-            column = json_str_column
-            df[column] = df[column].apply(json.dumps)
-
-    # ,date_format='%Y-%m-%dT%H:%M:%S.%f'
-    buffer = StringIO(df.to_json(orient="records", lines=True))
+        client = get_client('bigquery')  # dependency
 
     job_config = bigquery.LoadJobConfig(**job_config)
-
-    job_config.source_format = bigquery.SourceFormat.NEWLINE_DELIMITED_JSON
     job_config.write_disposition = write_mode
 
-    if schema:
-        job_config.schema = schema
+    if format.upper() == 'PARQUET':
+        if json_str_column:
+            json_str_column = [json_str_column] if isinstance(
+                json_str_column, str) else json_str_column
+            df = df.assign(**{column: df[column].map(json.dumps)
+                              for column in json_str_column})
+        _set_source_format(job_config, bigquery.SourceFormat.PARQUET)
+        buffer = _df_to_parquet(df, schema=schema)
+    else:
+        job_config.source_format = bigquery.SourceFormat.NEWLINE_DELIMITED_JSON
+        if schema:
+            job_config.schema = schema
+        buffer = _IterableReader(_df_ndjson_chunks(
+            df, schema=schema, json_str_column=json_str_column, chunk_rows=chunk_rows))
 
     logging.debug(f'Load job config: \n {job_config.to_api_repr()}')
     load_job = client.load_table_from_file(
         buffer, table_id, job_id=job_id, job_config=job_config)
-    return load_job
+    return _bq_table_cache_track(load_job, table_id, client)
 
 
-def dfs_to_excel(dfs, file, sheet_name=None, index=False, mode='w'):
+def _df_ndjson_chunks(df, schema=None, json_str_column=None, chunk_rows=50000):
+    """Encode DataFrame to newline delimited json bytes chunk by chunk without modifying df.
+
+    TIMESTAMP and DATE columns of schema are casted to strings with numpy.datetime_as_string, json_str_column objects are casted to json strings.
+    """
+    timestamp_columns = [field.name for field in schema or []
+                         if field.field_type == 'TIMESTAMP' and field.name in df.columns]
+    date_columns = [field.name for field in schema or []
+                    if field.field_type == 'DATE' and field.name in df.columns]
+    if isinstance(json_str_column, str):
+        json_str_column = [json_str_column]
+
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        columns = {}
+        for column in timestamp_columns:
+            columns[column] = _datetime_as_string(chunk[column], unit='us')
+        for column in date_columns:
+            columns[column] = _datetime_as_string(chunk[column], unit='D')
+        for column in json_str_column or []:
+            columns[column] = chunk[column].map(json.dumps)
+        if columns:
+            # assign returns new frame with references to unchanged columns
+            chunk = chunk.assign(**columns)
+
+        lines = chunk.to_json(orient="records", lines=True)
+        if not lines.endswith('\n'):
+            lines += '\n'
+        yield lines.encode('utf-8')
+
+
+def _datetime_as_string(series, unit='us'):
+    """Cast datetime series to ISO 8601 strings in UTC with numpy, unit 'us' for TIMESTAMP and 'D' for DATE. Nulls are kept."""
+    import numpy as np
+
+    values = series if pd.api.types.is_datetime64_any_dtype(
+        series) else pd.to_datetime(series)
+    if getattr(values.dt, 'tz', None) is not None:
+        values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+    strings = np.datetime_as_string(
+        values.to_numpy(dtype='datetime64[us]'), unit=unit)
+    return pd.Series(strings, index=series.index, dtype=object).where(values.notna().to_numpy(), None)
+
+
+class _IterableReader(io.RawIOBase):
+    """Readable binary file object over iterable of bytes chunks, used as streaming upload body."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = memoryview(b'')
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def read(self, size=-1):
+        output = bytearray()
+        while size < 0 or len(output) < size:
+            if not self._buffer:
+                try:
+                    self._buffer = memoryview(next(self._chunks))
+                except StopIteration:
+                    break
+                continue
+            n = len(self._buffer) if size < 0 else min(
+                size - len(output), len(self._buffer))
+            output += self._buffer[:n]
+            self._buffer = self._buffer[n:]
+        self._position += len(output)
+        return bytes(output)
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+
+def dfs_to_excel(dfs, file, sheet_name=None, index=False, mode='w', engine='openpyxl'):
     """ writers one or more dataframes to excel sheet(s)
 
+    Sheets with more rows than excel's limit of 1,048,576 rows are continued on new sheets named ``Sheet 1 (2)``, ``Sheet 1 (3)`` ...
+
     Arguments:
         dfs {pandas dataframe or list of dataframes} -- each dataframe will be written on a separate sheet
+            with ``stream`` engine, a dataframe can be replaced by iterable of dataframe chunks e.g. bq_to_df_iter(sql)
         file {str or io.BytesIO} -- excel filepath with .xlsx or xls extension or io.BytesIO (in_memory_file)
 
     Keyword Arguments:
@@ -488,12 +2148,17 @@ def dfs_to_excel(dfs, file, sheet_name=None, index=False, mode='w'):
         or else default sheet name will be used  (default: {Sheet 1, Sheet 2 ...})
         index {bool or list} -- if ture, writes dataframe index. For multi-sheet list of bool should be provided. By default index is ignored (default: {False})
         mode {str} -- {'w' = overwrite or creates new file, 'a' = append to existing file}, (default: {'w'}) #TODO validation
+        engine {str} -- {'openpyxl','stream'} (default: {'openpyxl'})
+            'stream' writes rows one by one with constant memory using XlsxWriter. It writes new files only, mode 'a' raises
+            ValueError since appending requires parsing the workbook with openpyxl.
 
     Example:
     file_name= 'file_with_many_sheets.xlsx'
     dfs=[df1,df2,df3,df4,df5]
     names=['trash1','trash2','trash3','trash4','trash5']
     dfs_to_excel(dfs,file_name,names)
+
+    dfs_to_excel(bq_to_df_iter(sql), file_name, engine='stream') # large query result
     """
     if isinstance(dfs, list):
         num_sheet = len(dfs)
@@ -504,16 +2169,117 @@ def dfs_to_excel(dfs, file, sheet_name=None, index=False, mode='w'):
         dfs = [dfs]
         index = [index]
 
+    sheet_name = _excel_sheet_names(num_sheet, sheet_name)
+
+    if engine == 'stream' and mode == 'a':
+        raise ValueError(
+            "stream engine writes new files only, use engine='openpyxl' to append to existing excel file")
+
+    if engine == 'stream':
+        sheets = [(sheet_name[i], *_excel_df_rows(dfs[i], index[i]))
+                  for i in range(num_sheet)]
+        _write_excel_stream(file, sheets)
+        return
+
+    with pd.ExcelWriter(path=file,  engine="openpyxl", date_format='YYYY-MM-DD', datetime_format='YYYY-MM-DD HH:MM:SS', mode=mode) as writer:
+        for i in range(num_sheet):
+            max_rows = _EXCEL_MAX_ROWS - 1  # header row
+            for part, start in enumerate(range(0, max(len(dfs[i]), 1), max_rows)):
+                dfs[i].iloc[start:start + max_rows].to_excel(
+                    writer, sheet_name=_excel_sheet_part_name(sheet_name[i], part), index=index[i])
+
+
+_EXCEL_MAX_ROWS = 1048576
+
+
+def _excel_sheet_names(num_sheet, sheet_name=None):
+    """Return list of sheet names, custom sheet_name is used if it matches number of sheets."""
     if num_sheet == 1 and sheet_name and type(sheet_name) == str:
-        sheet_name = [sheet_name]  # single custom sheet name
+        return [sheet_name]  # single custom sheet name
     elif num_sheet > 1 and type(sheet_name) == list and num_sheet == len(sheet_name):
-        pass  # multi-sheet file with custom name; all good
+        return sheet_name  # multi-sheet file with custom name; all good
     else:
-        sheet_name = [f'Sheet {n+1}' for n in range(num_sheet)]
+        return [f'Sheet {n+1}' for n in range(num_sheet)]
 
-    with pd.ExcelWriter(path=file,  engine="openpyxl", date_format='YYYY-MM-DD', datetime_format='YYYY-MM-DD HH:MM:SS', mode=mode) as writer:
-        for i in range(num_sheet):
-            dfs[i].to_excel(writer, sheet_name=sheet_name[i], index=index[i])
+
+def _excel_sheet_part_name(sheet_name, part):
+    """Return name of continuation sheet e.g. ``Sheet 1 (2)`` within excel's 31 character limit. Part 0 is the sheet itself."""
+    if not part:
+        return sheet_name
+    suffix = f" ({part + 1})"
+    return sheet_name[:31 - len(suffix)] + suffix
+
+
+def _excel_df_rows(df, index=False):
+    """Return header and generator of row tuples from DataFrame or iterable of DataFrame chunks."""
+    chunks = iter([df] if isinstance(df, pd.DataFrame) else df)
+    first = next(chunks, None)
+    if first is None:
+        return [], iter([])
+    header = ([first.index.name or ''] if index else []) + \
+        [str(column) for column in first.columns]
+    rows = itertools.chain.from_iterable(chunk.itertuples(index=index, name=None)
+                                         for chunk in itertools.chain([first], chunks))
+    return header, rows
+
+
+def _write_excel_stream(file, sheets):
+    """Write rows to xlsx file with XlsxWriter in constant memory mode, each row is flushed to disk once the next row is started.
+
+    Arguments:
+        file {str or io.BytesIO} -- excel filepath or io.BytesIO
+        sheets {iterable} -- of (sheet_name, header, rows) tuples where rows is iterable of tuples of values
+
+    Returns:
+        list -- names of written sheets
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(file, {'constant_memory': True, 'remove_timezone': True,
+                                          'strings_to_numbers': False, 'strings_to_formulas': False, 'strings_to_urls': False})
+    header_format = workbook.add_format({'bold': True})
+    date_format = workbook.add_format({'num_format': 'YYYY-MM-DD'})
+    datetime_format = workbook.add_format(
+        {'num_format': 'YYYY-MM-DD HH:MM:SS'})
+    written_sheets = []
+
+    def add_sheet(name, header):
+        worksheet = workbook.add_worksheet(name)
+        worksheet.write_row(0, 0, header, header_format)
+        written_sheets.append(name)
+        return worksheet
+
+    for sheet_name, header, rows in sheets:
+        part = 0
+        worksheet = add_sheet(sheet_name, header)
+        row_number = 1
+        for values in rows:
+            if row_number == _EXCEL_MAX_ROWS:
+                part += 1
+                worksheet = add_sheet(
+                    _excel_sheet_part_name(sheet_name, part), header)
+                row_number = 1
+            for column, value in enumerate(values):
+                if value is None or value is pd.NaT or (isinstance(value, float) and value != value):
+                    continue
+                elif isinstance(value, datetime.datetime):
+                    worksheet.write_datetime(
+                        row_number, column, value, datetime_format)
+                elif isinstance(value, datetime.date):
+                    worksheet.write_datetime(
+                        row_number, column, value, date_format)
+                elif isinstance(value, decimal.Decimal):
+                    worksheet.write_number(row_number, column, float(value))
+                elif isinstance(value, (dict, list)):
+                    worksheet.write_string(
+                        row_number, column, _JSON_ENCODER.encode(value))
+                else:
+                    worksheet.write(row_number, column, value)
+            row_number += 1
+        logging.debug(f"{sheet_name} written in {part + 1} sheet(s)")
+
+    workbook.close()
+    return written_sheets
 
 
 def bq_load_gcs_csv(source_uri, destination_table_id, schema=None, client=None, job_id=None, **job_config):
@@ -538,7 +2304,7 @@ def bq_load_gcs_csv(source_uri, destination_table_id, schema=None, client=None,
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
     job_config = bigquery.LoadJobConfig(**job_config)
     job_config.source_format = bigquery.SourceFormat.CSV
@@ -550,10 +2316,125 @@ def bq_load_gcs_csv(source_uri, destination_table_id, schema=None, client=None,
     load_job = client.load_table_from_uri(
         source_uri, destination_table_id, job_config=job_config, job_id=job_id)
     logging.debug(f"Starting job {load_job.job_id}")
-    return load_job
+    return _bq_table_cache_track(load_job, destination_table_id, client)
+
+
+_BQ_LOAD_MAX_URIS = 10000  # source uris per load job
+_BQ_LOAD_MAX_BYTES = 15 * 10 ** 12  # bytes per load job
+
+
+def bq_load_gcs_csv_bulk(source_uris, destination_table_id, schema=None, client=None, storage_client=None, max_workers=4,
+                         max_uris_per_job=_BQ_LOAD_MAX_URIS, max_bytes_per_job=_BQ_LOAD_MAX_BYTES, **job_config):
+    """Load many csv files from google cloud storage to Bigquery table with the fewest load jobs, running jobs concurrently.
+
+    Files are packed into groups within bigquery's limits of 10,000 source uris and 15 TB per load job, each group is loaded with
+    bq_load_gcs_csv. For write_disposition WRITE_TRUNCATE and WRITE_EMPTY, first group is loaded before the others are appended.
+    Files in one group are loaded atomically, a failed job fails all of its files.
+
+    Arguments:
+        source_uris {str, list} -- list of gcs uris or gcs prefix e.g. 'gs://bucketName/Folder/' or 'gs://bucketName/Folder/file_*.csv'
+        destination_table_id {str} -- fully qualified bq table id e.g. project_id.dataset.new_tablename
+
+    Keword Arguments:
+        schema {list} -- list of bigquery.schema.SchemaField, see bq_load_gcs_csv
+        client {bigquery.Client} -- defaults to client instantiated with default credentials
+        storage_client {google.storage.Client} -- storage client for listing source files (default: {None})
+        max_workers {int} -- maximum number of concurrent load jobs (default: {4})
+        max_uris_per_job {int} -- (default: {10000})
+        max_bytes_per_job {int} -- (default: {15 TB})
+        job_config {dict} -- any other keyowrd argument for bigquery.job.LoadJobConfig e.g. skip_leading_rows=1
+
+    Returns:
+        pandas.DataFrame -- one row per file with uri, size_MB, job_id, state {'DONE','FAILED','NOT_FOUND'} and errors columns
+
+    Example:
+    report = bq_load_gcs_csv_bulk('gs://bucketName/Folder/', 'project_id.dataset.table_name', skip_leading_rows=1)
+    report[report.state != 'DONE']
+
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
+    if not client:
+        logging.debug(
+            "instantiating bigquery client from defualt environment variable")
+        client = get_client('bigquery')  # dependency
+    if not storage_client:
+        logging.debug(
+            "instantiating storage client from defualt environment variable")
+        storage_client = get_client('storage')  # dependency
+
+    sizes = _gcs_blob_sizes(source_uris, storage_client)
+    report = {uri: {'uri': uri, 'size_MB': size/1000000 if size is not None else None, 'job_id': None,
+                    'state': 'NOT_FOUND' if size is None else None, 'errors': None} for uri, size in sizes.items()}
+
+    # first fit decreasing, bigquery doesn't guarantee load order of uris within a job
+    groups = []
+    for uri, size in sorted(((uri, size) for uri, size in sizes.items() if size is not None), key=lambda item: -item[1]):
+        for group in groups:
+            if len(group['uris']) < max_uris_per_job and group['bytes'] + size <= max_bytes_per_job:
+                break
+        else:
+            group = {'uris': [], 'bytes': 0}
+            groups.append(group)
+        group['uris'].append(uri)
+        group['bytes'] += size
+    logging.info(
+        f"loading {sum(len(group['uris']) for group in groups)} files to {destination_table_id} with {len(groups)} load jobs")
+
+    def load(group, config):
+        job = bq_load_gcs_csv(group['uris'], destination_table_id, schema=schema, client=client,
+                              job_id=create_bq_job_id('bq_load_gcs_csv_bulk'), **config)  # dependency
+        try:
+            job.result()
+            state, errors = 'DONE', None
+        except Exception as error:
+            logging.error(f"load job {job.job_id} failed: {error}")
+            state, errors = 'FAILED', job.errors or [{'message': str(error)}]
+        for uri in group['uris']:
+            report[uri].update(
+                {'job_id': job.job_id, 'state': state, 'errors': errors})
+        return state
+
+    append_config = dict(job_config)
+    if job_config.get('write_disposition') in ('WRITE_TRUNCATE', 'WRITE_EMPTY') and groups:
+        if load(groups[0], job_config) != 'DONE':
+            return pd.DataFrame(list(report.values()))
+        groups = groups[1:]
+        append_config['write_disposition'] = 'WRITE_APPEND'
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        list(executor.map(load, groups, [append_config] * len(groups)))
+
+    return pd.DataFrame(list(report.values()))
+
+
+def _gcs_blob_sizes(source_uris, storage_client):
+    """Return uri: size in bytes of gcs files, None for missing files.
+
+    Prefix or wildcard uri is expanded by listing the bucket, sizes of list of uris are read by listing each distinct folder once.
+    """
+    import fnmatch
+
+    if isinstance(source_uris, str):
+        bucket, _, pattern = source_uris[len('gs://'):].partition('/')
+        prefix = pattern.split('*')[0]
+        return {f"gs://{bucket}/{blob.name}": blob.size for blob in storage_client.list_blobs(bucket, prefix=prefix)
+                if not blob.name.endswith('/') and ('*' not in pattern or fnmatch.fnmatchcase(blob.name, pattern))}
+
+    folders = {}
+    for uri in dict.fromkeys(source_uris):
+        bucket, _, name = uri[len('gs://'):].partition('/')
+        folders.setdefault((bucket, name.rsplit('/', 1)[0] + '/' if '/' in name else ''), []).append(uri)
 
-def bq_export_csv_to_gcs(source_table_id, gcs_bucket, client=None, **job_config):
+    sizes = {}
+    for (bucket, prefix), uris in folders.items():
+        listed = {f"gs://{bucket}/{blob.name}": blob.size for blob in storage_client.list_blobs(
+            bucket, prefix=prefix, delimiter='/')}
+        sizes.update({uri: listed.get(uri) for uri in uris})
+    return sizes
+
+
+def bq_export_csv_to_gcs(source_table_id, gcs_bucket, client=None, destination_uri=None, **job_config):
     """Export bigquery table to gcs bucket as CSV. large files will be split into multiple files.
 
     Arguments:
@@ -562,7 +2443,9 @@ def bq_export_csv_to_gcs(source_table_id, gcs_bucket, client=None, **job_config)
 
     Keyword Arguments:
         client {bigquery.Client} -- defaults to client instantiated with default credentials
-        job_config {dict} -- keyowrd argument for bigquery.job.ExtractJobConfig
+        destination_uri {str} -- gcs uri with wildcard (*) for sharded export e.g. gs://bucket/folder/shard_*.parquet
+            (default: {None} i.e. gs://gcs_bucket/table_name.csv or gs://gcs_bucket/table_name/bigquery_export_*.csv for tables > 1000MB)
+        job_config {dict} -- keyowrd argument for bigquery.job.ExtractJobConfig e.g. destination_format='PARQUET' or 'AVRO'
 
     Returns:
         bigquery.job.ExtractJob
@@ -571,14 +2454,15 @@ def bq_export_csv_to_gcs(source_table_id, gcs_bucket, client=None, **job_config)
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
-    TABLE_NAME = source_table_id.split('.')[2]
-    # bytes converted to MB for large table > 1000MB
-    if client.get_table(source_table_id).num_bytes/1000000 > 1000:
-        destination_uri = "gs://{gcs_bucket}/{TABLE_NAME}/{'bigquery_export_*.csv'}"
-    else:
-        destination_uri = "gs://{gcs_bucket}/{TABLE_NAME}.csv"
+    if not destination_uri:
+        TABLE_NAME = source_table_id.split('.')[2]
+        # bytes converted to MB for large table > 1000MB
+        if _bq_get_table(source_table_id, client).num_bytes/1000000 > 1000:  # dependency
+            destination_uri = f"gs://{gcs_bucket}/{TABLE_NAME}/bigquery_export_*.csv"
+        else:
+            destination_uri = f"gs://{gcs_bucket}/{TABLE_NAME}.csv"
 
     job_config = bigquery.ExtractJobConfig(**job_config)
     extract_job = client.extract_table(
@@ -587,22 +2471,31 @@ def bq_export_csv_to_gcs(source_table_id, gcs_bucket, client=None, **job_config)
         job_config=job_config
 
     )
-    logging.info("Started exporting {source_table_id} to {destination_uri}")
+    logging.info(f"Started exporting {source_table_id} to {destination_uri}")
     return extract_job
 
 
-def create_bq_job_id(description=None):
+_JOB_ID_COUNTER = itertools.count(1)
+_JOB_ID_AGENTS = {}  # project: service account email prefix
+
+
+def create_bq_job_id(description=None, unique=True):
     """Create custom job id for bigquery jobs for logging and using the log as event in yyymmdd_hhmmss_EST_description pattern.
 
     Arguments:
         description {str} -- description of job. (load job, export, query, DML statements type, app, client id etc)
-            use searchable terms to pull the job from logs (default: service_account_email prefix)
+            use searchable terms to pull the job from logs (default: service_account_email prefix, looked up once per process)
+
+    Keyword Arguments:
+        unique {bool} -- if True, process-wide counter and random suffix are appended so ids created in the same second by
+            concurrent threads or processes don't collide, e.g. 20201201_101500_EST_description_000001_9f2c1a (default: {True})
 
     Returns:
         job_id {str} -- custom job Id with yyymmdd_hhmmss_EST_description pattern
 
     """
-    timezone = pytz.timezone("America/New_York")
+    import secrets
+
     utc_now = pytz.utc.localize(datetime.datetime.utcnow())
     est_now_str = utc_now.astimezone(pytz.timezone(
         "America/New_York")).strftime("%Y%m%d_%H%M%S_EST")
@@ -611,9 +2504,15 @@ def create_bq_job_id(description=None):
         description = description.replace(' ', '_')
         job_id = est_now_str + f"_{description}"
     else:
-        client = bigquery.Client()
-        agent = client.get_service_account_email()  # client from outer scope
-        job_id = est_now_str + f"_{agent.split('@')[0]}"
+        client = get_client('bigquery')  # dependency
+        agent = _JOB_ID_AGENTS.get(client.project)
+        if agent is None:
+            agent = client.get_service_account_email().split('@')[0]
+            _JOB_ID_AGENTS[client.project] = agent
+        job_id = est_now_str + f"_{agent}"
+
+    if unique:
+        job_id += f"_{next(_JOB_ID_COUNTER):06d}_{secrets.token_hex(3)}"
     return job_id
 
 
@@ -637,17 +2536,18 @@ def get_table_schema_from_bq(table_id, client=None, output_option='OBJECT'):
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
+    schema = _bq_get_table(table_id, client).schema  # dependency
     if output_option == 'LIST':
-        return [field.name for field in client.get_table(table_id).schema]
+        return [field.name for field in schema]
     elif output_option == 'DICT':
-        return [field.to_api_repr() for field in client.get_table(table_id).schema]
+        return [field.to_api_repr() for field in schema]
     else:
-        return client.get_table(table_id).schema
+        return schema
 
 
-def get_table_schema_from_df(df, bq_dtypes=None, output_options='OBJECT'):
+def get_table_schema_from_df(df, bq_dtypes=None, output_options='OBJECT', sample_size=None, seed=None):
     """Return table schema for Biqquery Table from pandas DataFrame with Bigquery compliant column names.
 
     Arguments:
@@ -659,6 +2559,11 @@ def get_table_schema_from_df(df, bq_dtypes=None, output_options='OBJECT'):
             'OBJECT' returns table schema as list of bigquery.schema.SchemaField
             'LIST' returns list of columns names
             'DICT' returns dictionary for each field : field_type. (default: bigquery schema object)
+        sample_size {int} -- if set, NESTED and REPEATED fields are inferred from up to sample_size non-null values of each object column
+            picked with reservoir sampling. Keys of all sampled records are merged at every nesting level and conflicting types are
+            widened e.g. INTEGER and FLOAT to FLOAT, DATE and TIMESTAMP to TIMESTAMP, other conflicts to STRING.
+            If None, fields are inferred from last non-null value of each column (default: {None})
+        seed {int} -- seed of the random sample for reproducible schema (default: {None})
 
     Returns:
         {list, dict} -- list of bigquery.schema.SchemaField|list of str|list of dict containing fields definition
@@ -670,6 +2575,9 @@ def get_table_schema_from_df(df, bq_dtypes=None, output_options='OBJECT'):
     # passing custom dtype for NESTED field
     get_table_schema_from_df(df,bq_dtypes={'date_obj':'DATETIME','entity_analysis': {'salience': 'STRING'},'document_classification':{'last updated':"DATE" }})
 
+    # union of keys of 1000 sampled records for sparse NESTED fields
+    get_table_schema_from_df(df,sample_size=1000)
+
     """
     column_names = list(df.columns)
 
@@ -683,14 +2591,13 @@ def get_table_schema_from_df(df, bq_dtypes=None, output_options='OBJECT'):
     else:
         new_column_names = column_names
 
+    output = _infer_schema_api_repr(df, sample_size=sample_size, seed=seed)
+
     if output_options == 'LIST':
-        return [_create_field_schema_api_repr(df[field]).get('name') for field in new_column_names]
+        return [field.get('name') for field in output]
     elif output_options == 'DICT':
-        return {_create_field_schema_api_repr(df[field]).get('name'): _create_field_schema_api_repr(df[field]).get('type') for field in new_column_names}
+        return {field.get('name'): field.get('type') for field in output}
     else:
-        output = [_create_field_schema_api_repr(
-            df[field]) for field in new_column_names]
-
         if bq_dtypes:
             for field_name, dtype in bq_dtypes.items():
                 for field in output:
@@ -716,157 +2623,353 @@ def get_table_schema_from_df(df, bq_dtypes=None, output_options='OBJECT'):
         return [bigquery.schema.SchemaField.from_api_repr(field) for field in output]
 
 
-def _create_field_schema_api_repr(series):
-    """Create field schema api_repr from pandas.Series (DataFrame column).
+_SERIES_DTYPE_TYPES = {
+    'bool': 'BOOLEAN',
+    'int': 'INTEGER',
+    'float': 'FLOAT',
+    'date': 'DATE',
+    'datetime': 'TIMESTAMP',
+    'object': 'STRING',
+    "string": 'STRING',
+}
+_OBJECT_CLASS_TYPES = {
+    'bool': 'BOOLEAN',
+    'int': 'INTEGER',
+    'float': 'FLOAT',
+    'timestamp': 'TIMESTAMP',
+    'date': 'DATE',
+    'datetime': 'DATETIME',
+    'str': 'STRING',
+    "string": 'STRING'
+}
+_DTYPE_PATTERN = re.compile(r"([a-z]*)[0-9]*")
+_CLASS_PATTERN = re.compile(r"<class '[a-z]*?[.]?([a-z]*)[0-9]*'>")
+_DATETIME_CLASS_PATTERN = re.compile(
+    r".*date.*|.*(Timestamp)'>", re.IGNORECASE)
+_BOOL_CLASS_PATTERN = re.compile(r"<class '.*\.(bool)_?'>")
+_DATETIME_VALUE_KEY = 'datetime value'  # class key is 'date' or 'timestamp' depending on time of value
+_DTYPE_KEYS = {}
+_CLASS_KEYS = {}
+
+
+def _dtype_key(dtype):
+    """Return class key for non-object dtype e.g. 'int' for int64, memoized by dtype."""
+    dtype_str = str(dtype)
+    key = _DTYPE_KEYS.get(dtype_str)
+    if key is None:
+        match = _DTYPE_PATTERN.search(dtype_str)
+        if match:
+            key = match.group(1)
+        else:
+            logging.debug(f"{dtype_str} not implemented")
+            key = 'str'  # unconfirmed default dtype
+        _DTYPE_KEYS[dtype_str] = key
+    return key
+
+
+def _class_key(sample_value):
+    """Return class key for object value e.g. 'datetime' for datetime.datetime, memoized by type of value."""
+    value_type = type(sample_value)
+    key = _CLASS_KEYS.get(value_type)
+    if key is None:
+        type_str = str(value_type)
+        if _CLASS_PATTERN.search(type_str):
+            key = _CLASS_PATTERN.search(type_str).group(1)
+        elif _DATETIME_CLASS_PATTERN.search(type_str):
+            key = _DATETIME_VALUE_KEY
+        elif _BOOL_CLASS_PATTERN.search(type_str):
+            key = 'bool'
+        else:
+            logging.debug(f"{type_str} not implemented")
+            key = 'str'  # unconfirmed default dtype
+        _CLASS_KEYS[value_type] = key
 
-    pandas.Series data type is mapped to Bigquery field type with object_regex_class_dict for object dtype series to find NESTED & REPEATED Fields below using regex
-    series_regex_dtype_dict is used for non-object dtypes series
+    if key == _DATETIME_VALUE_KEY:
+        if sample_value.hour == sample_value.minute == sample_value.microsecond == 0:
+            return 'date'
+        return 'timestamp'
+    return key
 
-    Returns:
-        dict -- with ``name``, ``type``, ``description``, `mode``,  and ``fields`` keys
 
-    """
-    series_regex_dtype_dict = {
-        'bool': 'BOOLEAN',
-        'int': 'INTEGER',
-        'float': 'FLOAT',
-        'date': 'DATE',
-        'datetime': 'TIMESTAMP',
-        'object': 'STRING',
-        "string": 'STRING',
-    }
-    object_regex_class_dict = {
-        'bool': 'BOOLEAN',
-        'int': 'INTEGER',
-        'float': 'FLOAT',
-        'timestamp': 'TIMESTAMP',
-        'date': 'DATE',
-        'datetime': 'DATETIME',
-        'str': 'STRING',
-        "string": 'STRING'
-    }
-
-    def dtype_from_object_sample(sample_value):
-        """Create key for object dtype series from last non-null value.
-
-        Sample_value is used to infer schema of nest & repreated field
-
-        Arguments:
-            sample_value {any} -- last non-null value is used to infer column type with regex
-
-        Returns:
-            str -- class key for for column
+def _object_field_type(sample_value):
+    """Return bigquery field type of object value."""
+    return _OBJECT_CLASS_TYPES.get(_class_key(sample_value), 'STRING')
 
-        """
-        class_pattern = re.compile(r"<class '[a-z]*?[.]?([a-z]*)[0-9]*'>")
-        datetime_pattern = re.compile(
-            r".*date.*|.*(Timestamp)'>", re.IGNORECASE)
-        bool_pattern = re.compile("<class '.*\.(bool)_?'>")
-
-        if (re.search(class_pattern, str(type(sample_value)))):
-            return re.search(class_pattern, str(type(sample_value))).group(1)
-        elif re.search(datetime_pattern, str(type(sample_value))):
-            if sample_value.hour == sample_value.minute == sample_value.microsecond == 0:
-                return 'date'
-            else:
-                return 'timestamp'
-        elif re.search(bool_pattern, str(type(sample_value))):
-            return 'bool'
+
+def _infer_schema_api_repr(df, sample_size=None, seed=None):
+    """Return list of field schema api_repr for DataFrame columns, dispatched on df.dtypes.
+
+    numpy integer and bool columns can't hold nulls and are mapped from dtype alone, float and naive datetime columns are decided
+    from first rows of all columns of the same dtype at once with _infer_head_field_types, other columns with _create_field_schema_api_repr.
+    With sample_size, object columns are inferred from sampled values with _sample_field_schema_api_repr.
+    """
+    import numpy as np
+
+    head_types = _infer_head_field_types(df)
+    output = []
+    for position, (name, dtype) in enumerate(df.dtypes.items()):
+        if len(df) and isinstance(dtype, np.dtype) and dtype.kind in 'iub':
+            # column isn't materialized as series
+            output.append({'mode': 'NULLABLE',
+                           'name': name,
+                           'type': _SERIES_DTYPE_TYPES.get(_dtype_key(dtype)),
+                           'description': None})
+        elif position in head_types:
+            output.append({'mode': 'NULLABLE',
+                           'name': name,
+                           'type': head_types[position],
+                           'description': None})
+        elif sample_size and dtype == object:
+            output.append(_sample_field_schema_api_repr(
+                df.iloc[:, position], sample_size, seed=seed))
         else:
-            logging.debug(f"{str(type(sample_value))} not implemented")
-            return 'str'  # unconfirmed default dtype
+            output.append(_create_field_schema_api_repr(df.iloc[:, position]))
+    return output
 
-    def dtype_from_series_dtype(series):
-        """Determine data type for each column from last non-null value.
 
-        Sample_value is used to infer schema of nest & repreated field
+def _last_valid_value(values, block_size=64):
+    """Return last non-null value of object array scanning from the end in blocks, None if all values are null."""
+    import numpy as np
 
-        Arguments:
-            sample_value {any} -- last non-null value is used to infer column type with regex
+    for end in range(len(values), 0, -block_size):
+        block = values[max(0, end - block_size):end]
+        not_null = np.flatnonzero(pd.notna(block))
+        if len(not_null):
+            return block[not_null[-1]]
+    return None
 
-        Returns:
-            str -- class key for for column
 
-        """
-        dtype_pattern = re.compile(r"([a-z]*)[0-9]*")
-        dtypes_str = str(series.dtypes)
-
-        if re.search(dtype_pattern, dtypes_str):
-            key = re.search(dtype_pattern, dtypes_str).group(1)
-            if key == 'datetime':
-                if series.dt.freq == 'D':
-                    return 'date'
-                else:
-                    return 'datetime'
-            else:
-                return key
+_SCHEMA_HEAD_ROWS = 1024
+
+
+def _infer_head_field_types(df, head_rows=_SCHEMA_HEAD_ROWS):
+    """Return position: field type of float and naive datetime columns decided from the first head_rows rows.
+
+    Columns of the same dtype are checked with one 2D array. Float columns with a non-null value in head are FLOAT, datetime columns
+    without NaT in head and with a step other than one day are TIMESTAMP i.e. not daily. Undecided columns are left out.
+    """
+    import numpy as np
+
+    groups = {}
+    for position, dtype in enumerate(df.dtypes):
+        if isinstance(dtype, np.dtype) and dtype.kind in 'fM':
+            groups.setdefault(dtype, []).append(position)
+
+    field_types = {}
+    if not len(df):
+        return field_types
+    for dtype, positions in groups.items():
+        head = df.iloc[:head_rows, positions].to_numpy()
+        if dtype.kind == 'f':
+            decided = pd.notna(head).any(axis=0)
+            field_type = _SERIES_DTYPE_TYPES.get(_dtype_key(dtype))
         else:
-            logging.debug(f"{dtypes_str} not implemented")
-            return 'str'  # unconfirmed default dtype
+            if len(head) < 2:
+                continue
+            day = np.timedelta64(1, 'D') // np.timedelta64(1, np.datetime_data(dtype)[0])
+            i8 = head.view('i8')
+            decided = (i8 != np.iinfo('i8').min).all(axis=0) & (
+                np.diff(i8, axis=0) != day).any(axis=0)
+            field_type = _SERIES_DTYPE_TYPES.get('datetime')
+        field_types.update({position: field_type for position,
+                            found in zip(positions, decided) if found})
+    return field_types
+
+
+def _has_valid_values(values, block_size=1024):
+    """Return True if array has any non-null value, first block is checked before scanning the whole array."""
+    if len(values) and pd.notna(values[:block_size]).any():
+        return True
+    return bool(len(values) > block_size and pd.notna(values).any())
+
+
+def _datetime_kind(series, head_size=64):
+    """Return 'date' if non-null values of datetime series step by exactly one day i.e. series.dropna().dt.freq == 'D',
+    'datetime' otherwise and None if all values are null.
+
+    Naive series are checked on int64 view without copying, irregular series are decided from the first head_size values.
+    """
+    import numpy as np
+
+    if series.dt.tz is not None:
+        values = series.dropna() if series.hasnans else series
+        if not len(values):
+            return None
+        return 'date' if len(values) >= 3 and values.dt.freq == 'D' else 'datetime'
+
+    values = series.to_numpy()
+    if not len(values):
+        return None
+    day = np.timedelta64(1, 'D') // np.timedelta64(1, np.datetime_data(values.dtype)[0])
+    nat = np.iinfo('i8').min
+    i8 = values.view('i8')
+
+    head = i8[:head_size]
+    head = head[head != nat]
+    if len(head) >= 2 and not (np.diff(head) == day).all():
+        return 'datetime'
+    if len(i8) >= 3 and (np.diff(i8) == day).all():
+        return 'date'  # steps from or to NaT are never one day
+    valid = i8[i8 != nat]
+    if not len(valid):
+        return None
+    if len(valid) == len(i8):
+        return 'datetime'
+    return 'date' if len(valid) >= 3 and (np.diff(valid) == day).all() else 'datetime'
 
-    series = series.dropna()
 
-    if isinstance(series, pd.Series) and len(series) > 0:
-        if str(series.dtypes) == 'object':
-            obj_sample = series.iloc[-1]  # last null values as sample
+def _create_field_schema_api_repr(series):
+    """Create field schema api_repr from pandas.Series (DataFrame column).
+
+    pandas.Series data type is mapped to Bigquery field type from dtype for non-object series, object series are mapped
+    from class of last non-null value to find NESTED & REPEATED Fields. Class keys are memoized by dtype and by class of value.
+
+    Returns:
+        dict -- with ``name``, ``type``, ``description``, `mode``,  and ``fields`` keys
+
+    """
+    field_type = 'STRING'
+    if series.dtype == object:
+        obj_sample = _last_valid_value(series.to_numpy())
+        if obj_sample is not None:
             if isinstance(obj_sample, list):
                 if isinstance(obj_sample[0], dict):
                     logging.debug(
                         f'{series.name} is NESTED and REPEATED field')
 
-                    children_fields = [{'mode': 'NULLABLE', 'name': key, 'type': object_regex_class_dict.get(dtype_from_object_sample(
-                        obj_sample[0].get(key)), 'STRING'), 'description': None} for key in list(obj_sample[0].keys())]
-
-                    field_schema_repr = {'mode': 'REPEATED',
-                                         'name': series.name,
-                                         'type': 'RECORD',
-                                         'description': None,
-                                         'fields': children_fields}
-                    return field_schema_repr
+                    children_fields = [{'mode': 'NULLABLE', 'name': key, 'type': _object_field_type(value), 'description': None}
+                                       for key, value in obj_sample[0].items()]
+                    return {'mode': 'REPEATED',
+                            'name': series.name,
+                            'type': 'RECORD',
+                            'description': None,
+                            'fields': children_fields}
                 else:
                     logging.debug(f'{series.name} is REPEATED field')
-
-                    field_schema_repr = {'mode': 'REPEATED',
-                                         'name': series.name,
-                                         'type': object_regex_class_dict.get(dtype_from_object_sample(obj_sample[0]), 'STRING'),
-                                         'description': None
-                                         }
-                    return field_schema_repr
+                    return {'mode': 'REPEATED',
+                            'name': series.name,
+                            'type': _object_field_type(obj_sample[0]),
+                            'description': None}
 
             elif isinstance(obj_sample, dict):
                 logging.debug(f'{series.name} is NESTED field')
 
-                children_fields = [{'mode': 'NULLABLE', 'name': key, 'type': object_regex_class_dict.get(dtype_from_object_sample(
-                    obj_sample.get(key)), 'STRING'), 'description': None} for key in list(obj_sample.keys())]
-                field_schema_repr = {'mode': 'NULLABLE',
-                                     'name': series.name,
-                                     'type': 'RECORD',
-                                     'description': None,
-                                     'fields': children_fields}
-                return field_schema_repr
-            else:
-                field_schema_repr = {'mode': 'NULLABLE',
-                                     'name': series.name,
-                                     'type': object_regex_class_dict.get(dtype_from_object_sample(obj_sample), 'STRING'),
-                                     'description': None
-                                     }
-                return field_schema_repr
-        else:
+                children_fields = [{'mode': 'NULLABLE', 'name': key, 'type': _object_field_type(value), 'description': None}
+                                   for key, value in obj_sample.items()]
+                return {'mode': 'NULLABLE',
+                        'name': series.name,
+                        'type': 'RECORD',
+                        'description': None,
+                        'fields': children_fields}
+            field_type = _object_field_type(obj_sample)
+    else:
+        key = _dtype_key(series.dtype)
+        if key == 'datetime':
+            kind = _datetime_kind(series)
+            if kind:
+                field_type = _SERIES_DTYPE_TYPES.get(kind)
+        elif _has_valid_values(series.array):
+            field_type = _SERIES_DTYPE_TYPES.get(key)
 
-            field_schema_repr = {'mode': 'NULLABLE',
-                                 'name': series.name,
-                                 'type': series_regex_dtype_dict.get(dtype_from_series_dtype(series)),
-                                 'description': None
-                                 }
-            return field_schema_repr
+    return {'mode': 'NULLABLE',
+            'name': series.name,
+            'type': field_type,
+            'description': None}
+
+
+_WIDER_FIELD_TYPES = {
+    frozenset(('INTEGER', 'FLOAT')): 'FLOAT',
+    frozenset(('DATE', 'DATETIME')): 'DATETIME',
+    frozenset(('DATE', 'TIMESTAMP')): 'TIMESTAMP',
+    frozenset(('DATETIME', 'TIMESTAMP')): 'TIMESTAMP',
+}
+
+
+def _widen_field_type(field_type, other_type):
+    """Return bigquery field type which can hold values of both types, STRING for incompatible types."""
+    if field_type is None or field_type == other_type:
+        return other_type
+    if other_type is None:
+        return field_type
+    return _WIDER_FIELD_TYPES.get(frozenset((field_type, other_type)), 'STRING')
+
+
+def _reservoir_sample(iterable, sample_size, rng):
+    """Return uniform random sample of up to sample_size items of iterable of unknown length in single pass.
+
+    Uses reservoir sampling with geometric skips (Algorithm L), items in between are skipped without drawing random numbers.
+    """
+    import math
+
+    iterator = iter(iterable)
+    reservoir = list(itertools.islice(iterator, sample_size))
+    if len(reservoir) < sample_size:
+        return reservoir
+
+    exhausted = object()
+    weight = math.exp(math.log(rng.random())/sample_size)
+    while True:
+        skip = int(math.log(rng.random())/math.log(1 - weight))
+        item = next(itertools.islice(iterator, skip, None), exhausted)
+        if item is exhausted:
+            return reservoir
+        reservoir[rng.randrange(sample_size)] = item
+        weight *= math.exp(math.log(rng.random())/sample_size)
 
-    else:
-        field_schema_repr = {'mode': 'NULLABLE',
-                                     'name': series.name,
-                                     'type': 'STRING',
-                                     'description': None
-                             }
-        return field_schema_repr
+
+def _is_null(value):
+    """Return True for None, NaN and NaT scalar values."""
+    return value is None or (not isinstance(value, (dict, list)) and pd.isna(value) is True)
+
+
+def _merge_field_schema_api_repr(name, values):
+    """Return field schema api_repr of name merged from list of non-null sample values.
+
+    Lists are REPEATED fields of their elements, dicts are RECORD fields with union of keys of all dicts, nested to any level.
+    """
+    mode = 'NULLABLE'
+    if any(isinstance(value, list) for value in values):
+        mode = 'REPEATED'
+        values = [element for value in values
+                  for element in (value if isinstance(value, list) else [value])
+                  if not _is_null(element)]
+
+    field = {'mode': mode, 'name': name, 'type': None, 'description': None}
+    if values and all(isinstance(value, dict) for value in values):
+        children = {}
+        for value in values:
+            for key, child_value in value.items():
+                children.setdefault(key, [])
+                if not _is_null(child_value):
+                    children[key].append(child_value)
+        field['type'] = 'RECORD'
+        field['fields'] = [_merge_field_schema_api_repr(key, child_values)
+                           for key, child_values in children.items()]
+        return field
+
+    for value in values:
+        if isinstance(value, (dict, list)):
+            field['type'] = 'STRING'  # mixed records and values or nested lists are loaded as strings
+            break
+        field['type'] = _widen_field_type(
+            field['type'], _object_field_type(value))
+    field['type'] = field['type'] or 'STRING'
+    return field
+
+
+def _sample_field_schema_api_repr(series, sample_size, seed=None):
+    """Create field schema api_repr of object series from last non-null value and random sample of up to sample_size non-null values."""
+    import random
+
+    values = series.to_numpy()
+    last_value = _last_valid_value(values)
+    if last_value is None:
+        return _create_field_schema_api_repr(series)
+
+    rng = random.Random(seed)
+    not_null = values[pd.notna(values)]
+    sample = [last_value] + _reservoir_sample(not_null, sample_size, rng)
+    return _merge_field_schema_api_repr(series.name, sample)
 
 
 def _validate_df_column_names(df, output_option='INVALID'):
@@ -987,10 +3090,9 @@ def get_gcp_service_account(credentials, storage_client=None):
 
         elif 'gs://' in credentials:
             if not storage_client:
-                from google.cloud import storage
                 logging.debug(
                     "instantiating storage client from defualt environment variable")
-                storage_client = storage.Client()
+                storage_client = get_client('storage')  # dependency
 
             credentials = gcs_download_blob(
                 credentials, output_option='CREDENTIALS')  # dependency
@@ -1021,7 +3123,7 @@ def bq_create_dataset(dataset_name='DataSources', client=None):
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
     project_id = client.project
     dataset_id = f"{project_id}.{dataset_name}"
@@ -1042,14 +3144,14 @@ def bq_list_datasets(client=None):
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
     project_id = client.project
     datasets = client.list_datasets(project=project_id)
     return [f"{project_id}.{dataset.dataset_id}" for dataset in datasets]
 
 
-def bq_list_tables(dataset, client=None, output_option='LIST'):
+def bq_list_tables(dataset, client=None, output_option='LIST', max_workers=8):
     """Return list of table_ids in the dataset.
 
     Arguments:
@@ -1071,6 +3173,10 @@ def bq_list_tables(dataset, client=None, output_option='LIST'):
                 table_labels {dict}
                 partitioning_type {str}
 
+            modified, size_MB and num_rows of all tables are read with single query of dataset's __TABLES__ meta table,
+            if the query fails tables are fetched concurrently on a thread pool
+        max_workers {int} -- maximum number of concurrent table requests of the fallback (default: {8})
+
     Return:
         {list} of table_ids in the dataset
 
@@ -1078,7 +3184,7 @@ def bq_list_tables(dataset, client=None, output_option='LIST'):
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
     if dataset.split('/') == 1:
         dataset = "{client.project}.".join(dataset)
@@ -1087,12 +3193,20 @@ def bq_list_tables(dataset, client=None, output_option='LIST'):
     if tables:
         logging.debug(f"{len(tables)} tables in {dataset}")
         if output_option == 'DF':
-            meta_data = []
+            try:
+                storage = _bq_table_storage(tables, client)
+            except Exception as error:
+                logging.debug(
+                    f"fetching tables of {dataset} concurrently: {error}")
+                fetched = _bq_get_tables(
+                    [_bq_table_id(table.reference) for table in tables], client, max_workers=max_workers)  # dependency
+                storage = {table_id: {"modified": table.modified, "size_MB": table.num_bytes/1000000 if table.num_bytes is not None else None,
+                                      "num_rows": table.num_rows} for table_id, table in fetched.items()}
 
+            meta_data = []
             for table in tables:
                 t = f"{table.project}.{table.dataset_id}.{table.table_id}"
-                table = client.get_table(t)
-                meta_data.append({"table_id": t, "table_name": table.table_id, "created": table.created, "modified": table.modified, "size_MB": table.num_bytes/1000000, "num_rows": table.num_rows                              # should be nested and repeated
+                meta_data.append({"table_id": t, "table_name": table.table_id, "created": table.created, **storage[t]  # should be nested and repeated
                                   , "table_type": table.table_type, "table_labels": table.labels, "partitioning_type": table.partitioning_type})
             return pd.DataFrame(meta_data)
         else:
@@ -1101,6 +3215,22 @@ def bq_list_tables(dataset, client=None, output_option='LIST'):
         logging.debug(f"{dataset} dataset does not contain any tables.")
 
 
+def _bq_table_storage(tables, client):
+    """Return table_id: {modified, size_MB, num_rows} for list of bigquery.table.TableListItem of one dataset with single __TABLES__ query."""
+    project, dataset_id = tables[0].project, tables[0].dataset_id
+    sql = f"SELECT table_id, last_modified_time, size_bytes, row_count FROM `{project}.{dataset_id}.__TABLES__`"
+    epoch = datetime.datetime(1970, 1, 1, tzinfo=pytz.utc)
+
+    storage = {}
+    for row in client.query(sql).result():
+        storage[f"{project}.{dataset_id}.{row['table_id']}"] = {"modified": epoch + datetime.timedelta(milliseconds=row['last_modified_time']),
+                                                               "size_MB": row['size_bytes']/1000000, "num_rows": row['row_count']}
+    missing = [table.table_id for table in tables if f"{project}.{dataset_id}.{table.table_id}" not in storage]
+    if missing:
+        raise LookupError(f"{missing} not found in __TABLES__")
+    return storage
+
+
 def bq_update_table_metadata(table_id, table_description=None, table_labels=None, client=None):
     """Update bigquery table description and labels.
 
@@ -1119,7 +3249,7 @@ def bq_update_table_metadata(table_id, table_description=None, table_labels=None
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
     table = client.get_table(table_id)
 
@@ -1131,6 +3261,7 @@ def bq_update_table_metadata(table_id, table_description=None, table_labels=None
         table.labels = table_labels
         table = client.update_table(table, ["labels"])
         logging.debug(f"Labels added to {table_id}")
+    bq_table_cache_clear(table_id, client=client)
     return table
 
 
@@ -1154,8 +3285,9 @@ def bq_create_table(table_id, schema, partition_column_name=None, cluster_column
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
+    bq_table_cache_clear(table_id, client=client)
     if if_exists == 'REPLACE':
         client.delete_table(table_id, not_found_ok=True)
         logging.debug(f"deleted {table_id}")
@@ -1204,14 +3336,14 @@ def bq_copy_table(source_table_id, destination_table_id, write_mode='WRITE_EMPTY
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
     job_config = bigquery.CopyJobConfig(**job_config)
     job_config.write_disposition = write_mode
     job = client.copy_table(
         source_table_id, destination_table_id, job_config=job_config, job_id=job_id)
 
-    return job
+    return _bq_table_cache_track(job, destination_table_id, client)
 
 
 def bq_del_table(table_id, client=None):
@@ -1227,33 +3359,78 @@ def bq_del_table(table_id, client=None):
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
     client.delete_table(table_id)
+    bq_table_cache_clear(table_id, client=client)
     logging.debug(f'{table_id} was deleted')
 
 
-def bq_restore_table(table_id, snapshot_datetime=None, client=None):
-    """Restore bigquery table to a previous snapshot or recover deleted table.
+def bq_clone_table(source_table_id, destination_table_id, write_mode='WRITE_EMPTY', snapshot_epoch=None, job_id=None, client=None):
+    """Create zero-copy clone of source bigquery table with CREATE TABLE CLONE statement. Clone is created in seconds regardless of table size
+    and only data changed after cloning is billed as storage of destination table.
+
+    Arguments:
+        source_table_id {str} -- fully qualified bq table id of source table e.g. project_id.dataset.tablename
+        destination_table_id {str} -- fully qualified bq table id of clone e.g. project_id.dataset.new_tablename
+
+    Keyword Arguments:
+        write_mode {str} -- {'WRITE_TRUNCATE', 'WRITE_EMPTY'} WRITE_TRUNCATE replaces existing destination table,
+            WRITE_EMPTY fails if destination table exists (default: {'WRITE_EMPTY'})
+        snapshot_epoch {int} -- clone source table as of unix milliseconds within time travel window (default: {None} i.e. current version)
+        job_id {str} -- use function create_bq_job_id(description=None) to create custom job id
+        client {bigquery.Client} -- (default: {None})
+
+    Returns:
+        bigquery.job.QueryJob
+
+    """
+    if not client:
+        logging.debug(
+            "instantiating bigquery client from defualt environment variable")
+        client = get_client('bigquery')  # dependency
+
+    create = 'CREATE OR REPLACE TABLE' if write_mode == 'WRITE_TRUNCATE' else 'CREATE TABLE'
+    sql = f"{create} `{destination_table_id}` CLONE `{source_table_id}`"
+    if snapshot_epoch is not None:
+        sql += f" FOR SYSTEM_TIME AS OF TIMESTAMP_MILLIS({int(snapshot_epoch)})"
+    job = client.query(sql, job_id=job_id)
+
+    return _bq_table_cache_track(job, destination_table_id, client)
+
+
+def bq_restore_table(table_id, snapshot_datetime=None, client=None, use_clone=True, max_concurrent=10):
+    """Restore bigquery tables to a previous snapshot or recover deleted tables. Tables are restored concurrently to the same snapshot.
 
         copy of existing table can be recovered within 7 days
         deleted table can be restored with 2 days of deletion
         recovered table is suffixed with timestamp_restored e.g. project_id.dataset.recovered_table_name_timestamp_restored
+        existing tables are restored as zero-copy clones with bq_clone_table, deleted tables and failed clones are restored with copy jobs
 
     Arguments:
-        table_id {str} -- fully qualified id of modified/deleted table e.g. project_id.dataset.table_name
+        table_id {str|list} -- fully qualified id or list of ids of modified/deleted tables e.g. project_id.dataset.table_name
 
     Keyword Arguments:
         snapshot_datetime {str} -- datetime string in "%Y-%m-%dT%H:%M:%S.%fEST" format to milliseconds resolution and EST:America/New_York timezone. DEFAULTS to 2 hours before current EST.
             example1: snapshot_datetime= "2020-01-22T14:00:00.000EST"
             example2: snapshot_datetime= "2019-12-31T14:11:17.651EST"
         client {bigquery.Client} -- (default: {None})
+        use_clone {bool} -- if False, every table is restored with copy job (default: {True})
+        max_concurrent {int} -- maximum number of running restore jobs (default: {10})
+
+    Returns:
+        dict -- table_id: restored_table_id of restored tables, failed restores are logged
+
+    Example:
+    bq_restore_table(['project_id.dataset.orders', 'project_id.dataset.customers'], snapshot_datetime="2020-01-22T14:00:00.000EST")
 
     """
+    from functools import partial
+
     if not client:
         logging.debug(
             "instantiating bigquery client from defualt environment variable")
-        client = bigquery.Client()
+        client = get_client('bigquery')  # dependency
 
     if snapshot_datetime:
 
@@ -1273,16 +3450,124 @@ def bq_restore_table(table_id, snapshot_datetime=None, client=None):
         logging.debug(
             f"2 hours ago snapshot timestamp: {datetime_datetime} EST <=> unix_millis:{snapshot_epoch}")
 
-    snapshot_table_id = f"{table_id}@{snapshot_epoch}"
-    restored_table_id = table_id+'_'+str_datetime+'_restored'
+    table_ids = [table_id] if isinstance(table_id, str) else list(dict.fromkeys(table_id))
+    restored_table_ids = {
+        table_id: table_id+'_'+str_datetime+'_restored' for table_id in table_ids}
+    existing = _bq_existing_table_ids(table_ids, client) if use_clone else set()
 
-    job = client.copy_table(
-        snapshot_table_id,
-        restored_table_id,
-        location="US",
-    )
-    try:
-        job.result()
-        logging.debug(f"{table_id} was restored as {restored_table_id}")
-    except Exception as err:
-        logging.debug(str(err.message))
+    def copy_spec(table_id):
+        return partial(bq_copy_table, f"{table_id}@{snapshot_epoch}", restored_table_ids[table_id], client=client)  # dependency
+
+    specs = [partial(bq_clone_table, table_id, restored_table_ids[table_id], snapshot_epoch=snapshot_epoch, client=client)  # dependency
+             if table_id in existing else copy_spec(table_id) for table_id in table_ids]
+    summary = bq_run_jobs(specs, max_concurrent=max_concurrent,
+                          client=client)  # dependency
+
+    failed_clones = [error['index']
+                     for error in summary['errors'] if table_ids[error['index']] in existing]
+    if failed_clones:
+        logging.debug(
+            f"{len(failed_clones)} clones failed, restoring with copy jobs")
+        retry = bq_run_jobs([copy_spec(table_ids[index]) for index in failed_clones],
+                            max_concurrent=max_concurrent, client=client)  # dependency
+        summary['errors'] = [error for error in summary['errors'] if error['index'] not in failed_clones] + \
+            [dict(error, index=failed_clones[error['index']])
+             for error in retry['errors']]
+
+    failed = {table_ids[error['index']] for error in summary['errors']}
+    for error in summary['errors']:
+        logging.debug(
+            f"{table_ids[error['index']]} was not restored: {error['message']}")
+    for table_id in table_ids:
+        if table_id not in failed:
+            logging.debug(
+                f"{table_id} was restored as {restored_table_ids[table_id]}")
+
+    return {table_id: restored_table_id for table_id, restored_table_id in restored_table_ids.items() if table_id not in failed}
+
+
+def bq_copy_dataset(source_dataset, destination_dataset, write_mode='WRITE_TRUNCATE', use_clone=False, skip_unchanged=True, table_names=None,
+                    client=None, max_concurrent=20):
+    """Copy or clone all tables of source dataset to destination dataset concurrently.
+
+    Tables whose destination copy was modified after the last modification of source table are skipped, so repeated runs only copy changed tables.
+    Views, materialized views and external tables are not copied.
+
+    Arguments:
+        source_dataset {str} -- dataset_id of source dataset e.g. project_id.dataset_name
+        destination_dataset {str} -- dataset_id of existing destination dataset e.g. project_id.dataset_name
+
+    Keyword Arguments:
+        write_mode {str} -- {'WRITE_TRUNCATE', 'WRITE_EMPTY'} (default: {'WRITE_TRUNCATE'})
+        use_clone {bool} -- if True, tables are created as zero-copy clones with bq_clone_table instead of copy jobs (default: {False})
+        skip_unchanged {bool} -- if False, every table is copied (default: {True})
+        table_names {list} -- copy only these table names of source dataset (default: {None} i.e. all tables)
+        client {bigquery.Client} -- (default: {None})
+        max_concurrent {int} -- maximum number of running copy jobs (default: {20})
+
+    Returns:
+        dict -- copied {list}, skipped {list} and failed {list of dict with table_id and message}
+
+    Example:
+    bq_copy_dataset('project_id.dataset_dev', 'project_id.dataset_prod', use_clone=True)
+
+    """
+    from functools import partial
+
+    if not client:
+        logging.debug(
+            "instantiating bigquery client from defualt environment variable")
+        client = get_client('bigquery')  # dependency
+
+    source_tables = bq_list_tables(
+        source_dataset, client=client, output_option='DF')  # dependency
+    if source_tables is None:
+        return {'copied': [], 'skipped': [], 'failed': []}
+    destination_tables = bq_list_tables(
+        destination_dataset, client=client, output_option='DF') if skip_unchanged else None  # dependency
+    destination_modified = dict(zip(destination_tables.table_name, destination_tables.modified)
+                                ) if destination_tables is not None else {}
+
+    copied, skipped, specs = [], [], []
+    for table in source_tables.itertuples():
+        if table_names is not None and table.table_name not in table_names:
+            continue
+        if table.table_type != 'TABLE':
+            logging.debug(f"{table.table_id} is {table.table_type}, not copied")
+            continue
+        if table.table_name in destination_modified and destination_modified[table.table_name] >= table.modified:
+            skipped.append(table.table_id)
+            continue
+        destination_table_id = f"{destination_dataset}.{table.table_name}"
+        copy = bq_clone_table if use_clone else bq_copy_table  # dependency
+        specs.append(partial(copy, table.table_id, destination_table_id,
+                             write_mode=write_mode, client=client))
+        copied.append(table.table_id)
+
+    logging.debug(
+        f"copying {len(specs)} tables from {source_dataset} to {destination_dataset}, {len(skipped)} unchanged tables skipped")
+    summary = bq_run_jobs(specs, max_concurrent=max_concurrent,
+                          client=client)  # dependency
+    failed = [{'table_id': copied[error['index']], 'message': error['message']}
+              for error in summary['errors']]
+    failed_ids = {error['table_id'] for error in failed}
+
+    return {'copied': [table_id for table_id in copied if table_id not in failed_ids], 'skipped': skipped, 'failed': failed}
+
+
+def _bq_existing_table_ids(table_ids, client, max_workers=8):
+    """Return set of table_ids which currently exist, tables are fetched concurrently."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def exists(table_id):
+        try:
+            _bq_get_table(table_id, client)
+            return True
+        except Exception:
+            return False
+
+    table_ids = list(table_ids)
+    if not table_ids:
+        return set()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(table_ids))) as executor:
+        return {table_id for table_id, found in zip(table_ids, executor.map(exists, table_ids)) if found}